@@ -0,0 +1,142 @@
+"""Pacote de assets pré-processados: pixels já escalados, lidos do disco com um único mmap.
+
+    python assets_bundle.py            # gera assets/bundle.bin a partir dos PNGs
+
+O jogo usa o pacote quando ele existe e corresponde aos PNGs e às dimensões atuais de
+settings.py; caso contrário, decodifica os PNGs e gera o pacote depois do primeiro frame.
+"""
+import mmap
+import os
+import struct
+
+import pygame
+from settings import *
+
+BUNDLE_MAGIC = b'FBAB'
+BUNDLE_VERSION = 1
+BUNDLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'bundle.bin')
+
+# nome: (arquivo de origem, tamanho final, formato dos pixels)
+BUNDLE_ENTRIES = {
+    'bird_sprite': ('bird.png', (PLAYER_SIZE, PLAYER_SIZE), 'RGBA'),
+    'pipe_sprite': ('pipe.png', (PIPE_WIDTH, int(SCREEN_HEIGHT * 1.5)), 'RGBA'),
+    'background_sky': ('ceu.png', (SCREEN_WIDTH, SCREEN_HEIGHT), 'RGB'),
+    'game_over_screen': ('game_over.png', (SCREEN_WIDTH, SCREEN_HEIGHT), 'RGBA'),
+}
+
+_HEADER = struct.Struct('<4sHI')
+_ENTRY = struct.Struct('<HHQQqQ')
+
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def build_bundle(path=BUNDLE_FILE):
+    """Decodifica e escala cada PNG uma única vez e grava os pixels crus num só arquivo."""
+    assets_dir = os.path.dirname(path)
+    index = bytearray()
+    blobs = []
+    offset = 0
+    for name, (filename, size, fmt) in BUNDLE_ENTRIES.items():
+        source = os.path.join(assets_dir, filename)
+        image = pygame.image.load(source)
+        # Mesmo resultado de transform.scale sobre a imagem convertida no jogo: escala por vizinho mais próximo.
+        pixels = pygame.image.tobytes(pygame.transform.scale(image, size), fmt)
+        source_size, source_mtime = _source_stamp(source)
+        encoded_name = name.encode('utf-8')
+        index += struct.pack('<B', len(encoded_name)) + encoded_name + fmt.encode('ascii').ljust(4)
+        index += _ENTRY.pack(size[0], size[1], offset, len(pixels), source_mtime, source_size)
+        blobs.append(pixels)
+        offset += len(pixels)
+
+    # Grava ao lado e troca no fim: um jogo fechado no meio da gravação não deixa um pacote pela metade.
+    partial = path + '.tmp'
+    with open(partial, 'wb') as f:
+        f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(BUNDLE_ENTRIES)))
+        f.write(index)
+        for pixels in blobs:
+            f.write(pixels)
+    os.replace(partial, path)
+    return path, offset
+
+
+class AssetBundle:
+    """Índice do pacote mapeado em memória; cada superfície é criada direto sobre os bytes do mmap."""
+
+    def __init__(self, path=BUNDLE_FILE):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.entries = self._read_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_index(self):
+        data = self._map
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            raise ValueError("Pacote de assets em formato desconhecido.")
+        pos = _HEADER.size
+        entries = {}
+        for _ in range(count):
+            name_length = data[pos]
+            name = bytes(data[pos + 1:pos + 1 + name_length]).decode('utf-8')
+            pos += 1 + name_length
+            fmt = bytes(data[pos:pos + 4]).decode('ascii').strip()
+            pos += 4
+            width, height, offset, length, source_mtime, source_size = _ENTRY.unpack_from(data, pos)
+            pos += _ENTRY.size
+            entries[name] = ((width, height), fmt, offset, length, (source_size, source_mtime))
+        self._data_start = pos
+        return entries
+
+    def is_current(self):
+        """O pacote corresponde aos PNGs de origem e às dimensões definidas em settings.py?"""
+        assets_dir = os.path.dirname(self.path)
+        for name, (filename, size, fmt) in BUNDLE_ENTRIES.items():
+            entry = self.entries.get(name)
+            if entry is None or entry[0] != size or entry[1] != fmt:
+                return False
+            source = os.path.join(assets_dir, filename)
+            if os.path.exists(source) and _source_stamp(source) != entry[4]:
+                return False
+        return True
+
+    def surface(self, name):
+        """Superfície já convertida para o formato da tela (exige display.set_mode)."""
+        size, fmt, offset, length, _ = self.entries[name]
+        start = self._data_start + offset
+        raw = pygame.image.frombuffer(memoryview(self._map)[start:start + length], size, fmt)
+        # convert()/convert_alpha() copiam os pixels: a superfície final não depende do mmap.
+        return raw.convert_alpha() if fmt == 'RGBA' else raw.convert()
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def open_bundle(path=BUNDLE_FILE):
+    """Abre o pacote se ele existir e estiver atualizado; senão retorna None (o jogo usa os PNGs)."""
+    if not os.path.exists(path):
+        return None
+    try:
+        bundle = AssetBundle(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if not bundle.is_current():
+        bundle.close()
+        return None
+    return bundle
+
+
+if __name__ == '__main__':
+    output, total = build_bundle()
+    print(f"{len(BUNDLE_ENTRIES)} assets, {total / 1024 / 1024:.1f} MB de pixels -> {output}")
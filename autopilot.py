@@ -0,0 +1,217 @@
+"""Piloto automático: busca em profundidade sobre sequências de flap/não-flap, com a física do jogo.
+
+Usado no modo de demonstração (attract mode) e como jogador roteirizado nas simulações:
+
+    python simulate.py --policy autopilot --runs 20
+"""
+import time
+from collections import namedtuple
+
+from settings import *
+from course import SPAWN_X
+from simulation import HeadlessSimulation, next_vertical_speed, pipe_y_offset
+
+# Retrato do mundo no fim de um tick. pipes: [(x float, topo do vão, base do vão)] sem o deslocamento senoidal.
+WorldState = namedtuple('WorldState', ['tick', 'bird_x', 'bird_y', 'vertical_speed', 'is_started',
+                                       'pipes', 'course', 'pipe_speed', 'rate', 'v_speed_mult', 'gap_size',
+                                       'gravity', 'flap_strength', 'max_fall_speed'])
+
+
+def state_from_sim(sim):
+    return WorldState(sim.tick, sim.bird_x, sim.bird_y, sim.vertical_speed, sim.is_started,
+                      [(pipe[0], pipe[2], pipe[3]) for pipe in sim.pipes], sim.course,
+                      sim.pipe_speed, sim.rate, sim.v_speed_mult, sim.gap_size,
+                      sim.gravity, sim.flap_strength, sim.max_fall_speed)
+
+
+def state_from_game(game):
+    """Mesmo retrato a partir de Bird e PipeManager (os canos de cima e de baixo de cada par são consecutivos)."""
+    bird = game.bird
+    manager = game.pipe_manager
+    sprites = manager.pipes.sprites()
+    pipes = []
+    for top, bottom in zip(sprites[0::2], sprites[1::2]):
+        pipes.append((top.x, top.initial_y + top.rect.height, bottom.initial_y))
+    speed_setting = game.current_speed_setting
+    return WorldState(manager.tick, bird.rect.x, bird.rect.y, bird.vertical_speed, bird.is_started,
+                      pipes, manager.course, speed_setting['pipe_speed'], FPS * speed_setting['fps_mult'],
+                      game.current_mechanic_setting['v_speed_mult'], GAP_SIZE,
+                      GRAVITY, FLAP_STRENGTH, MAX_FALL_SPEED)
+
+
+class Autopilot:
+    """Decide o flap de cada tick procurando uma sequência de ações que sobreviva `horizon` ticks.
+
+    Os estados (tick, y, velocidade, começou) são exatos: a velocidade depende só de quantos
+    ticks se passaram desde o último flap. Estados sem saída ficam memorizados entre decisões
+    (quem morre antes de um horizonte também morre antes de qualquer horizonte maior), e o
+    plano encontrado na decisão anterior é o primeiro caminho tentado na seguinte.
+    """
+
+    BIRD_SIZE = HeadlessSimulation.BIRD_SIZE
+    PIPE_HITBOX_WIDTH = HeadlessSimulation.PIPE_HITBOX_WIDTH
+    PIPE_HEIGHT = HeadlessSimulation.PIPE_HEIGHT
+
+    def __init__(self, horizon=AUTOPILOT_HORIZON, max_nodes=AUTOPILOT_MAX_NODES, masks=None):
+        self.horizon = horizon
+        self.max_nodes = max_nodes
+        self.masks = masks
+        self._dead = set()
+        self._hits = {}
+        self._plan = []
+        self.decisions = 0
+        self.nodes = 0
+        self.elapsed = 0.0
+
+    def reset(self):
+        self._dead.clear()
+        self._hits.clear()
+        self._plan = []
+
+    def _obstacles(self, state, last_tick):
+        """(x float no fim do tick de referência, tick de referência, topo, base) dos canos na tela e dos
+        que nascem até last_tick; o x em qualquer tick posterior é x - velocidade * ticks decorridos."""
+        obstacles = [(x, state.tick, gap_top, gap_bottom) for x, gap_top, gap_bottom in state.pipes]
+        half = state.gap_size // 2
+        for segment in state.course.upcoming(COURSE_LOOKAHEAD):
+            if segment.spawn_tick > last_tick:
+                break
+            # O cano nasce em SPAWN_X e já se move no próprio tick do spawn.
+            obstacles.append((SPAWN_X, segment.spawn_tick - 1,
+                              segment.gap_center - half, segment.gap_center + half))
+        return obstacles
+
+    def _collides(self, y, tick, started, obstacles, state):
+        """Mesma regra de HeadlessSimulation.step para o pássaro na altura y, no fim do tick `tick`."""
+        bird_x = state.bird_x
+        size = self.BIRD_SIZE
+        offset = 0
+        if state.v_speed_mult > 0:
+            offset = pipe_y_offset(tick / state.rate, state.v_speed_mult, PIPE_AMPLITUDE)
+        masks = self.masks
+        height = self.PIPE_HEIGHT
+        width = self.PIPE_HITBOX_WIDTH
+        speed = state.pipe_speed
+
+        for x0, tick0, gap_top, gap_bottom in obstacles:
+            if tick <= tick0:
+                continue
+            x = int(x0 - speed * (tick - tick0))
+            if masks is not None:
+                if bird_x < x + PIPE_WIDTH and bird_x + PLAYER_SIZE > x:
+                    dx = x - bird_x
+                    if masks.bird.overlaps(masks.top, dx, gap_top + offset - height - y) or \
+                            masks.bird.overlaps(masks.bottom, dx, gap_bottom + offset - y):
+                        return True
+            elif bird_x < x + width and bird_x + size > x:
+                top = gap_top + offset
+                bottom = gap_bottom + offset
+                if (y < top and y + size > top - height) or (y < bottom + height and y + size > bottom):
+                    return True
+        return started and (y <= 0 or y + size >= SCREEN_HEIGHT)
+
+    def _survives(self, tick, y, vertical_speed, started, depth, obstacles, state, plan, prefer):
+        """DFS: existe sequência que chega ao horizonte? Preenche `plan` (ações a partir deste tick)."""
+        if depth == 0:
+            return True
+        key = (tick, y, vertical_speed, started)
+        if key in self._dead or self._budget <= 0:
+            return False
+        self._budget -= 1
+        self.nodes += 1
+
+        # Primeiro a ação do plano anterior; senão, a que leva em direção ao centro do próximo vão.
+        first = prefer[0] if prefer else (y + self.BIRD_SIZE // 2 > self._target(tick, obstacles, state))
+        for flap in (first, not first):
+            vs = vertical_speed
+            is_started = started
+            if flap:
+                vs = state.flap_strength
+                is_started = True
+            new_y = y
+            if is_started:
+                vs = next_vertical_speed(vs, state.gravity, state.max_fall_speed)
+                new_y = y + int(vs)
+            # O mundo não depende das ações: o resultado da colisão em (tick, y) vale para todos os caminhos.
+            hit_key = (tick + 1, new_y, is_started)
+            hit = self._hits.get(hit_key)
+            if hit is None:
+                hit = self._hits[hit_key] = self._collides(new_y, tick + 1, is_started, obstacles, state)
+            if hit:
+                continue
+            if self._survives(tick + 1, new_y, vs, is_started, depth - 1, obstacles, state, plan,
+                              prefer[1:] if prefer and flap == first else ()):
+                plan.append(flap)
+                return True
+
+        if self._budget > 0:
+            self._dead.add(key)
+        return False
+
+    def _target(self, tick, obstacles, state):
+        """Centro do próximo vão à frente do pássaro no tick dado (ou o meio da tela)."""
+        speed = state.pipe_speed
+        for x0, tick0, gap_top, gap_bottom in obstacles:
+            if tick >= tick0 and int(x0 - speed * (tick - tick0)) + self.PIPE_HITBOX_WIDTH >= state.bird_x:
+                offset = 0
+                if state.v_speed_mult > 0:
+                    offset = pipe_y_offset(tick / state.rate, state.v_speed_mult, PIPE_AMPLITUDE)
+                return (gap_top + gap_bottom) // 2 + offset + 10
+        return SCREEN_HEIGHT // 2 + 10
+
+    def decide(self, state):
+        """True se o pássaro deve bater asas antes do próximo tick."""
+        start = time.perf_counter()
+        tick = state.tick
+        if not state.is_started:
+            # Parado, o pássaro só "sobrevive" até o primeiro cano chegar, além do horizonte: começa já.
+            self.decisions += 1
+            self.elapsed += time.perf_counter() - start
+            return True
+        obstacles = self._obstacles(state, tick + self.horizon)
+        self._budget = self.max_nodes
+        plan = []
+        prefer = self._plan[1:]
+        found = self._survives(tick, state.bird_y, state.vertical_speed, state.is_started, self.horizon,
+                               obstacles, state, plan, prefer)
+        plan.reverse()
+        if found:
+            self._plan = plan
+            flap = plan[0]
+        else:
+            # Sem saída dentro do orçamento: segue a heurística do jogador roteirizado.
+            self._plan = []
+            flap = state.bird_y + self.BIRD_SIZE // 2 > self._target(tick, obstacles, state) and state.vertical_speed >= 0
+
+        if self.decisions % 256 == 0:
+            self._dead = {key for key in self._dead if key[0] >= tick}
+            self._hits = {key: hit for key, hit in self._hits.items() if key[0] >= tick}
+        self.decisions += 1
+        self.elapsed += time.perf_counter() - start
+        return flap
+
+    def stats(self):
+        return {
+            'decisions': self.decisions,
+            'decisions_per_second': self.decisions / self.elapsed if self.elapsed else 0.0,
+            'nodes_per_decision': self.nodes / self.decisions if self.decisions else 0.0,
+            'ms_per_decision': self.elapsed / self.decisions * 1000 if self.decisions else 0.0,
+        }
+
+
+def autopilot_policy(masks=None, horizon=AUTOPILOT_HORIZON):
+    """Política para HeadlessSimulation.run; o Autopilot fica acessível em policy.autopilot.
+
+    A mesma política pode jogar várias partidas seguidas: a memória da busca é zerada a cada simulação nova.
+    """
+    autopilot = Autopilot(horizon=horizon, masks=masks)
+    current = [None]
+
+    def policy(sim):
+        if sim is not current[0]:
+            current[0] = sim
+            autopilot.reset()
+        return autopilot.decide(state_from_sim(sim))
+
+    policy.autopilot = autopilot
+    return policy
@@ -0,0 +1,142 @@
+import random
+
+import pygame
+from settings import *
+
+SKYLINE_COLORKEY = (255, 0, 255)
+
+
+class ParallaxLayer:
+    """Faixa horizontal pré-composta que se repete a cada `strip.get_width()` pixels."""
+
+    def __init__(self, strip, y, factor):
+        self.strip = strip
+        self.y = y
+        self.factor = factor
+        self.width = strip.get_width()
+        self.height = strip.get_height()
+
+
+def _skyline_strip(rng, width, height, color, window_color, min_width, max_width):
+    """Prédios (e janelas acesas) em uma faixa que fecha sem emenda nas bordas, no tamanho lógico."""
+    strip = pygame.Surface((width, height))
+    strip.fill(SKYLINE_COLORKEY)
+    x = 0
+    while x < width:
+        building = pygame.Rect(x, height - rng.randint(height // 3, height), rng.randint(min_width, max_width), height)
+        windows = []
+        if window_color is not None:
+            windows = [(wx, wy, 4, 6)
+                       for wy in range(building.top + 8, height - 10, 14)
+                       for wx in range(building.left + 6, building.right - 8, 12) if rng.random() < 0.3]
+        # O prédio que passa da borda direita é desenhado de novo no começo da faixa.
+        for offset in (0, -width):
+            strip.fill(color, building.move(offset, 0))
+            for wx, wy, ww, wh in windows:
+                strip.fill(window_color, (wx + offset, wy, ww, wh))
+        x += building.width + rng.randint(0, max_width // 3)
+    return strip
+
+
+class ParallaxBackground:
+    """Céu e silhuetas da cidade em camadas com rolagem em paralaxe.
+
+    Cada camada é composta uma única vez, já no formato e na escala do quadro de desenho.
+    Ela fica numa faixa que se repete horizontalmente (o céu é espelhado para fechar sem
+    emenda), e as silhuetas só ocupam a altura da própria faixa, com colorkey RLE. Cada
+    camada custa no máximo dois blits de sub-retângulo.
+
+    update() devolve só a faixa das camadas que andaram pelo menos um pixel (todas as faixas vão
+    até a base da tela): o DirtyRectRenderer redesenha e apresenta essa faixa e, acima dela,
+    continua restaurando o fundo só sob os sprites do frame anterior (restore_items).
+    """
+
+    def __init__(self, sky, display, layers=PARALLAX_LAYERS, sky_factor=PARALLAX_SKY_FACTOR, seed=BACKGROUND_SEED):
+        self.scale = display.scale
+        self.width, height = display.render_size
+        rng = random.Random(seed)
+
+        sky = pygame.transform.smoothscale(sky, display.render_size) if sky.get_size() != display.render_size else sky
+        sky_strip = pygame.Surface((self.width * 2, height)).convert()
+        sky_strip.blit(sky, (0, 0))
+        sky_strip.blit(pygame.transform.flip(sky, True, False), (self.width, 0))
+        self.layers = [ParallaxLayer(sky_strip, 0, sky_factor)]
+
+        for factor, band, color, window_color in layers:
+            band_height = int(SCREEN_HEIGHT * band)
+            strip = _skyline_strip(rng, SCREEN_WIDTH * 2, band_height, color, window_color,
+                                   int(40 + 40 * factor), int(80 + 80 * factor))
+            size = (self.width * 2, max(1, round(band_height * self.scale)))
+            if size != strip.get_size():
+                # Vizinho mais próximo: mantém a cor do colorkey exata nas bordas.
+                strip = pygame.transform.scale(strip, size)
+            strip = strip.convert()
+            strip.set_colorkey(SKYLINE_COLORKEY, pygame.RLEACCEL)
+            self.layers.append(ParallaxLayer(strip, height - size[1], factor))
+
+        self.height = height
+        self._offsets = None
+        self.update(0)
+
+    def _offsets_at(self, distance):
+        scaled_distance = distance * self.scale
+        return [int(scaled_distance * layer.factor) % layer.width for layer in self.layers]
+
+    def blit_items(self, distance, top=0):
+        """Trios (faixa, destino, área) para Surface.blits, só das linhas a partir de `top` (no quadro de
+        desenho); distance em pixels lógicos percorridos pelos canos."""
+        return self._items(self._offsets_at(distance), top)
+
+    def _items(self, offsets, top):
+        items = []
+        screen_width = self.width
+        for layer, offset in zip(self.layers, offsets):
+            row = max(0, top - layer.y)
+            height = layer.height - row
+            if height <= 0:
+                continue
+            y = layer.y + row
+            first = min(layer.width - offset, screen_width)
+            items.append((layer.strip, (0, y), (offset, row, first, height)))
+            if first < screen_width:
+                items.append((layer.strip, (first, y), (0, row, screen_width - first, height)))
+        return items
+
+    def update(self, distance):
+        """Avança as camadas até a distância dada; retorna a faixa que mudou (Rect no quadro de desenho) ou None."""
+        offsets = self._offsets_at(distance)
+        previous = self._offsets
+        self._offsets = offsets
+        if previous is None:
+            top = 0
+        else:
+            moved = [layer.y for layer, offset, last in zip(self.layers, offsets, previous) if offset != last]
+            if not moved:
+                return None
+            top = min(moved)
+        return pygame.Rect(0, top, self.width, self.height - top)
+
+    def items(self, top=0):
+        """Blits do fundo na posição atual, das linhas a partir de `top`."""
+        return self._items(self._offsets, top)
+
+    def restore_items(self, rects, bottom):
+        """Blits que refazem o fundo atual nas regiões dadas, só acima da linha `bottom`."""
+        items = []
+        screen = pygame.Rect(0, 0, self.width, bottom)
+        for rect in rects:
+            rect = screen.clip(rect)
+            if not rect:
+                continue
+            for layer, offset in zip(self.layers, self._offsets):
+                top = max(rect.top, layer.y)
+                end = min(rect.bottom, layer.y + layer.height)
+                if top >= end:
+                    continue
+                row = top - layer.y
+                x = (offset + rect.left) % layer.width
+                first = min(layer.width - x, rect.width)
+                items.append((layer.strip, (rect.left, top), (x, row, first, end - top)))
+                if first < rect.width:
+                    items.append((layer.strip, (rect.left + first, top), (0, row, rect.width - first, end - top)))
+        return items
@@ -0,0 +1,77 @@
+"""Compara um screen.blit por sprite com o envio em lote via RenderQueue/Surface.blits."""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+from settings import *
+from renderer import RenderQueue
+
+
+def make_sprites(count, seed, size):
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    bird = pygame.transform.scale(
+        pygame.image.load(os.path.join(base_path, 'assets', 'bird.png')).convert_alpha(), (size, size))
+    rng = random.Random(seed)
+    return [(bird, (rng.randrange(SCREEN_WIDTH - size), rng.randrange(SCREEN_HEIGHT - size)))
+            for _ in range(count)]
+
+
+def bench_individual(screen, sprites, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        for surface, pos in sprites:
+            screen.blit(surface, pos)
+    return (time.perf_counter() - start) / frames
+
+
+def bench_batched(screen, sprites, frames):
+    queue = RenderQueue()
+    start = time.perf_counter()
+    for _ in range(frames):
+        for surface, pos in sprites:
+            queue.submit(surface, pos)
+        queue.flush(screen)
+    return (time.perf_counter() - start) / frames
+
+
+def bench_prebuilt(screen, sprites, frames):
+    """Limite inferior do lote: a lista (superfície, posição) já está montada."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.blits(sprites, False)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sprites', type=int, nargs='+', default=[2, 20, 200])
+    parser.add_argument('--frames', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--size', type=int, default=PLAYER_SIZE, help="Lado dos sprites em pixels.")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    print(f"{'sprites':>8} | {'blit por sprite':>16} | {'RenderQueue':>14} | {'blits pronto':>14} | ganho")
+    for count in args.sprites:
+        sprites = make_sprites(count, args.seed, args.size)
+        t_single = bench_individual(screen, sprites, args.frames)
+        t_batch = bench_batched(screen, sprites, args.frames)
+        t_prebuilt = bench_prebuilt(screen, sprites, args.frames)
+        print(f"{count:>8} | {t_single * 1e6:>13.1f} µs | {t_batch * 1e6:>11.1f} µs | "
+              f"{t_prebuilt * 1e6:>11.1f} µs | {t_single / t_batch:.2f}x")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
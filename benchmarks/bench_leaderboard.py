@@ -0,0 +1,108 @@
+"""Ranking com um milhão de linhas sintéticas: migração, top-N por modo/dia/jogador, paginação e posição."""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import DIFFICULTY_SPEEDS, PHASE_MECHANICS
+from database import DatabaseManager
+
+
+def create_legacy_db(path, rows, seed):
+    """Cria o banco no esquema antigo (sem colunas de modo nem índices)."""
+    rng = random.Random(seed)
+    modes = [f"{mech} ({speed})" for mech in PHASE_MECHANICS for speed in DIFFICULTY_SPEEDS]
+    players = [f"Player{i}" for i in range(500)]
+    start = datetime(2025, 1, 1)
+
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            difficulty TEXT NOT NULL,
+            timestamp TEXT NOT NULL
+        )
+    """)
+    batch = []
+    for _ in range(rows):
+        timestamp = start + timedelta(seconds=rng.randrange(365 * 86400))
+        batch.append((rng.choice(players), int(rng.expovariate(1 / 20)), rng.choice(modes),
+                      timestamp.strftime('%Y-%m-%d %H:%M:%S')))
+        if len(batch) == 100_000:
+            conn.executemany("INSERT INTO scores (name, score, difficulty, timestamp) VALUES (?, ?, ?, ?)", batch)
+            batch.clear()
+    if batch:
+        conn.executemany("INSERT INTO scores (name, score, difficulty, timestamp) VALUES (?, ?, ?, ?)", batch)
+    conn.commit()
+    conn.close()
+
+
+def timed(label, fn, repeat=20):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<44} {elapsed * 1000:>9.3f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ranking_bench.db')
+        start = time.perf_counter()
+        create_legacy_db(path, args.rows, args.seed)
+        print(f"{args.rows:,} linhas sintéticas em {time.perf_counter() - start:.1f}s")
+
+        legacy = sqlite3.connect(path)
+        print("Esquema antigo:")
+        timed("top 10 geral (ORDER BY em toda a tabela)", lambda: legacy.execute(
+            "SELECT name, score, difficulty, timestamp FROM scores ORDER BY score DESC, timestamp ASC LIMIT 10").fetchall(), 3)
+        timed("top 10 do modo (filtro no texto)", lambda: legacy.execute(
+            "SELECT name, score, difficulty, timestamp FROM scores WHERE difficulty = 'ESTÁTICO (DIFÍCIL)' "
+            "ORDER BY score DESC, timestamp ASC LIMIT 10").fetchall(), 3)
+        timed("posição da pontuação 40", lambda: legacy.execute(
+            "SELECT COUNT(*) FROM scores WHERE score > 40").fetchone(), 3)
+        legacy.close()
+
+        start = time.perf_counter()
+        db = DatabaseManager(path)
+        print(f"Migração para o esquema indexado: {time.perf_counter() - start:.1f}s")
+
+        print("Esquema indexado:")
+        timed("top 10 geral", lambda: db._query_top_scores())
+        timed("top 10 do modo", lambda: db.get_scores_page("ESTÁTICO", "DIFÍCIL"))
+        rows, cursor = db.get_scores_page("ESTÁTICO", "DIFÍCIL", limit=1000)
+        for _ in range(50):
+            rows, cursor = db.get_scores_page("ESTÁTICO", "DIFÍCIL", after=cursor, limit=1000)
+        timed("página 52 do modo (keyset, 1000/página)", lambda: db.get_scores_page("ESTÁTICO", "DIFÍCIL", after=cursor))
+        timed("top 10 do dia", lambda: db.get_scores_page(day="2025-06-01"))
+        timed("top 10 do jogador", lambda: db.get_scores_page(player="Player42"))
+        timed("posição da pontuação 40 (geral)", lambda: db.get_rank(40))
+        timed("posição da pontuação 40 (modo)", lambda: db.get_rank(40, "ESTÁTICO", "DIFÍCIL"))
+
+        print("Planos de consulta:")
+        for sql in ("SELECT name FROM scores ORDER BY score DESC, timestamp ASC LIMIT 10",
+                    "SELECT name FROM scores WHERE mechanic = 'a' AND speed = 'b' ORDER BY score DESC, timestamp ASC, id ASC LIMIT 10",
+                    "SELECT name FROM scores WHERE substr(timestamp, 1, 10) = 'x' ORDER BY score DESC, timestamp ASC, id ASC LIMIT 10",
+                    "SELECT COUNT(*) FROM scores WHERE score > 40"):
+            plan = db._conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+            print("  " + " | ".join(row[-1] for row in plan))
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""Teste de carga do ranking compartilhado: centenas de clientes simultâneos no localhost.
+
+    python benchmarks/bench_leaderboard_server.py --clients 300 --submissions 20
+    python benchmarks/bench_leaderboard_server.py --batch-size 1      # uma transação por envio, para comparar
+    python benchmarks/bench_leaderboard_server.py --address unix:/tmp/ranking_bench.sock
+
+Servidor e clientes rodam no mesmo loop asyncio. Cada cliente mantém uma conexão, envia
+suas pontuações uma a uma e pede o top a cada --top-every envios. Os clientes 2k e 2k+1 enviam
+as mesmas partidas (nome, pontuação, modo e segundo), como dois gabinetes com o jogador padrão,
+cada uma com seu id de envio. No fim, o banco é conferido: todas as pontuações gravadas uma
+única vez (nenhuma partida dos pares fundida, nenhum reenvio duplicado) e o top em memória
+igual ao do SQLite.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from settings import DIFFICULTY_SPEEDS, PHASE_MECHANICS, LEADERBOARD_SIZE, LEADERBOARD_SERVER_BATCH
+from leaderboard_client import encode_message, encode_score
+from leaderboard_server import LeaderboardServer
+from bench_leaderboard import create_legacy_db
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run_client(index, args, open_connection, modes, latencies):
+    # Os dois clientes de cada par geram as mesmas partidas.
+    pair = index // 2
+    rng = random.Random(args.seed * 100_003 + pair)
+    reader, writer = await open_connection()
+    start = datetime(2026, 1, 1) + timedelta(days=pair)
+
+    async def request(message, kind):
+        sent = time.perf_counter()
+        writer.write(encode_message(message))
+        reply = json.loads(await reader.readline())
+        latencies[kind].append(time.perf_counter() - sent)
+        if not reply['ok']:
+            raise RuntimeError(reply['error'])
+        return reply
+
+    # Espera todos conectarem antes de começar a carga.
+    await args.ready.wait()
+    rows = []
+    for i in range(args.submissions):
+        row = (f"Player{pair}", int(rng.expovariate(1 / 20)), rng.choice(modes),
+               (start + timedelta(seconds=i)).strftime('%Y-%m-%d %H:%M:%S'), None, uuid.uuid4().hex)
+        rows.append(row)
+        await request({'op': 'submit', 'scores': [encode_score(row)]}, 'submit')
+        if args.top_every and (i + 1) % args.top_every == 0:
+            await request({'op': 'top', 'limit': LEADERBOARD_SIZE}, 'top')
+
+    # Reenvio (como depois de uma confirmação perdida): nada pode ser gravado de novo.
+    reply = await request({'op': 'submit', 'scores': [encode_score(row) for row in rows]}, 'resubmit')
+    writer.close()
+    return reply['inserted']
+
+
+async def run(args, db_file):
+    server = LeaderboardServer(db_file, batch_size=args.batch_size)
+    address = args.address
+    await server.start(address)
+    if address.startswith('unix:'):
+        path = address[len('unix:'):]
+        open_connection = lambda: asyncio.open_unix_connection(path)
+    else:
+        host, port = server.sockname()[:2]
+        open_connection = lambda: asyncio.open_connection(host, port)
+
+    modes = [f"{mech} ({speed})" for mech in PHASE_MECHANICS for speed in DIFFICULTY_SPEEDS]
+    latencies = {'submit': [], 'top': [], 'resubmit': []}
+    args.ready = asyncio.Event()
+    tasks = [asyncio.create_task(run_client(i, args, open_connection, modes, latencies)) for i in range(args.clients)]
+    while server.connections < args.clients:
+        await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    args.ready.set()
+    duplicated = sum(await asyncio.gather(*tasks))
+    elapsed = time.perf_counter() - start
+
+    top_reply = json.loads(await server.top_reply(LEADERBOARD_SIZE))['scores']
+    stats = server.stats()
+    await server.close()
+    return elapsed, latencies, stats, duplicated, top_reply
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=300)
+    parser.add_argument('--submissions', type=int, default=20, help="Envios por cliente.")
+    parser.add_argument('--top-every', type=int, default=5, help="Pede o top a cada N envios (0 = nunca).")
+    parser.add_argument('--batch-size', type=int, default=LEADERBOARD_SERVER_BATCH,
+                        help="Máximo de pontuações por transação no servidor.")
+    parser.add_argument('--address', default='tcp://127.0.0.1:0')
+    parser.add_argument('--rows', type=int, default=100_000, help="Linhas já existentes no banco.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'ranking_server_bench.db')
+        if args.rows:
+            create_legacy_db(db_file, args.rows, args.seed)
+
+        elapsed, latencies, stats, duplicated, top_reply = asyncio.run(run(args, db_file))
+
+        submissions = args.clients * args.submissions
+        print(f"{args.clients} clientes x {args.submissions} envios em {elapsed:.2f}s: "
+              f"{submissions / elapsed:,.0f} envios/s, {len(latencies['top']) / elapsed:,.0f} tops/s")
+        for kind, values in latencies.items():
+            if values:
+                print(f"  {kind:<9} p50 {percentile(values, 0.5) * 1000:7.2f} ms   "
+                      f"p99 {percentile(values, 0.99) * 1000:7.2f} ms   máx {max(values) * 1000:7.2f} ms")
+        print(f"  {stats['transactions']} transações, {stats['rows_per_transaction']:.1f} pontuações por transação; "
+              f"{stats['top_queries_db']} de {stats['top_queries']} tops consultaram o banco")
+
+        conn = sqlite3.connect(db_file)
+        count = conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        db_top = [list(row) for row in conn.execute(
+            "SELECT name, score, difficulty, timestamp FROM scores ORDER BY score DESC, timestamp ASC, id ASC LIMIT ?",
+            (LEADERBOARD_SIZE,))]
+        conn.close()
+        ok = count == args.rows + submissions and duplicated == 0 and top_reply == db_top
+        print(f"Conferência: {count:,} linhas (esperadas {args.rows + submissions:,}), "
+              f"{duplicated} reenvio(s) gravado(s) de novo, top em memória {'igual' if top_reply == db_top else 'DIFERENTE'} "
+              f"ao do banco -> {'ok' if ok else 'FALHOU'}")
+        if not ok:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Compara pássaros-passos por segundo: sprites Bird (escalar), HeadlessSimulation e PopulationSimulator (NumPy)."""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import numpy as np
+import pygame
+
+from settings import *
+from player import Bird
+from simulation import HeadlessSimulation
+from population import PopulationSimulator
+
+
+def flap_schedule(n_birds, ticks, seed):
+    rng = np.random.default_rng(seed)
+    return rng.random((ticks, n_birds)) < 0.05
+
+
+def bench_bird_sprites(n_birds, flaps, course):
+    """Caminho escalar: um Bird por pássaro, update() e colliderect contra os canos do percurso."""
+    sprite = pygame.Surface((PLAYER_SIZE, PLAYER_SIZE))
+    birds = [Bird(None, None, sprite) for _ in range(n_birds)]
+    for bird in birds:
+        bird.rect.topleft = BIRD_START_POS
+    alive = [True] * n_birds
+    width, height = course.PIPE_HITBOX_WIDTH, course.PIPE_HEIGHT
+
+    start = time.perf_counter()
+    for tick_flaps in flaps:
+        course.step(False)
+        pipe_rects = []
+        for pipe in course.pipes:
+            pipe_rects.append(pygame.Rect(pipe[1], pipe[2] - height, width, height))
+            pipe_rects.append(pygame.Rect(pipe[1], pipe[3], width, height))
+        for i, bird in enumerate(birds):
+            if not alive[i]:
+                continue
+            if tick_flaps[i]:
+                bird.flap()
+            bird.update()
+            if bird.rect.collidelist(pipe_rects) != -1 or bird.rect.top <= 0 or bird.rect.bottom >= SCREEN_HEIGHT:
+                alive[i] = False
+    return time.perf_counter() - start
+
+
+def bench_headless(n_birds, flaps, seed):
+    sims = [HeadlessSimulation(seed=seed) for _ in range(n_birds)]
+    start = time.perf_counter()
+    for tick_flaps in flaps:
+        for i, sim in enumerate(sims):
+            sim.step(tick_flaps[i])
+    return time.perf_counter() - start
+
+
+def bench_population(n_birds, flaps, seed):
+    pop = PopulationSimulator(n_birds, seed=seed)
+    start = time.perf_counter()
+    for tick_flaps in flaps:
+        pop.step(tick_flaps)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--birds', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'pássaros':>9} | {'Bird (sprites)':>15} | {'Headless':>15} | {'NumPy':>15} | ganho")
+    for n_birds in args.birds:
+        flaps = flap_schedule(n_birds, args.ticks, args.seed)
+        steps = n_birds * args.ticks
+        t_bird = bench_bird_sprites(n_birds, flaps, HeadlessSimulation(seed=args.seed))
+        t_headless = bench_headless(n_birds, flaps, args.seed)
+        t_pop = bench_population(n_birds, flaps, args.seed)
+        print(f"{n_birds:>9} | {steps / t_bird:>15,.0f} | {steps / t_headless:>15,.0f} | "
+              f"{steps / t_pop:>15,.0f} | {t_bird / t_pop:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
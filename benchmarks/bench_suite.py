@@ -0,0 +1,328 @@
+"""Suíte de benchmarks dos caminhos quentes do jogo (headless), com comparação contra uma linha de base.
+
+    python benchmarks/bench_suite.py --output bench_results.json
+    python benchmarks/bench_suite.py --baseline bench_results.json --threshold 0.15
+
+Com --baseline, cada medição é comparada pela mediana; as que ficaram mais lentas que o
+limite são marcadas como regressão e o código de saída passa a ser 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+from settings import *
+from bench_leaderboard import create_legacy_db
+
+STARTUP_SNIPPET = """
+import main
+game = main.Game()
+# Um único frame do menu: o QUIT chega no início do segundo.
+main.pygame.time.set_timer(main.pygame.QUIT, 1, loops=1)
+try:
+    game.run()
+except SystemExit:
+    pass
+print(game.init_time, game.first_frame_time)
+"""
+
+
+def measure(fn, number, repeat, setup=None):
+    """Executa fn() `number` vezes por repetição e retorna segundos por chamada (mediana e mínimo).
+
+    A primeira repetição é só aquecimento (caches, alocador, páginas do SQLite) e é descartada.
+    """
+    times = []
+    for i in range(repeat + 1):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if i:
+            times.append((time.perf_counter() - start) / number)
+    return {'median_s': statistics.median(times), 'min_s': min(times), 'number': number, 'repeat': repeat}
+
+
+def fill_pipes(game, pairs, spacing=PIPE_WIDTH * 2.5):
+    """Coloca `pairs` pares de canos em ordem de spawn, o primeiro na coluna do pássaro e com ele no centro do vão."""
+    manager = game.pipe_manager
+    manager.reset(0)
+    game.bird.reset()
+    for _ in range(pairs):
+        manager.spawn_pipe()
+    sprites = manager.pipes.sprites()
+    for i, pipe in enumerate(sprites):
+        pipe.x = float(game.bird.rect.x + (i // 2) * spacing)
+        pipe.rect.x = int(pipe.x)
+    top, bottom = sprites[0], sprites[1]
+    game.bird.rect.centery = (top.rect.bottom + bottom.rect.top) // 2
+    game.bird.initial_pos = game.bird.rect.topleft
+    return [(pipe, pipe.x, pipe.passed) for pipe in sprites]
+
+
+def restore_pipes(game, saved):
+    manager = game.pipe_manager
+    for pipe, x, passed in saved:
+        pipe.x = x
+        pipe.rect.x = int(x)
+        pipe.passed = passed
+        if pipe not in manager.pipes:
+            manager.pool.remove(pipe)
+            manager.pipes.add(pipe)
+    manager.tick = 0
+    game.bird.reset()
+
+
+def bench_pipes(game, args, results):
+    pipe_sprite = game.assets['pipe_sprite']
+    from pipe import Pipe
+    results['pipe_init'] = measure(
+        lambda: Pipe(SCREEN_WIDTH, 200, 200, 'bottom', pipe_sprite, 0.0), args.number, args.repeat)
+
+    manager = game.pipe_manager
+
+    def spawn_and_recycle():
+        manager.spawn_pipe()
+        for pipe in manager.pipes.sprites():
+            manager._release(pipe)
+
+    results['spawn_pipe'] = measure(spawn_and_recycle, args.number, args.repeat, setup=lambda: manager.reset(0))
+
+    for pairs in args.pipes:
+        saved = fill_pipes(game, pairs)
+        # Menos chamadas que o intervalo de spawn: a quantidade de canos fica constante na medição.
+        calls = min(args.number, 60)
+        results[f'pipe_manager_update[{pairs}]'] = measure(
+            manager.update, calls, args.repeat, setup=lambda: restore_pipes(game, saved))
+
+
+def bench_collisions(game, args, results):
+    for pairs in args.pipes:
+        saved = fill_pipes(game, pairs)
+        game.current_state = STATE_PLAYING
+        results[f'check_collisions[{pairs}]'] = measure(game.check_collisions, args.number, args.repeat)
+        # No cenário montado o pássaro está dentro do vão: a fase estreita roda, mas não pode colidir.
+        if game.current_state != STATE_PLAYING:
+            raise RuntimeError("check_collisions detectou colisão no cenário do benchmark.")
+        restore_pipes(game, saved)
+
+
+def bench_render(game, args, results):
+    for pairs in args.pipes:
+        saved = fill_pipes(game, pairs)
+        game.current_state = STATE_PLAYING
+        game.renderer.invalidate()
+        game.draw_playing_frame(0.5)
+        results[f'playing_frame[{pairs}]'] = measure(lambda: game.draw_playing_frame(0.5), args.number, args.repeat)
+        restore_pipes(game, saved)
+
+
+def bench_background(game, args, results):
+    """Fundo da partida: o céu fixo num único blit contra o céu e as silhuetas em paralaxe (2 blits por camada)."""
+    from background import ParallaxBackground
+
+    screen = game.display.target
+    sky = game.renderer.background
+    results['background_static'] = measure(lambda: screen.blit(sky, (0, 0)), args.number, args.repeat)
+
+    background = ParallaxBackground(game.assets['background_sky'], game.display)
+    clock = [0.0]
+
+    def parallax_frame():
+        clock[0] += 3.7
+        screen.blits(background.blit_items(clock[0]), False)
+
+    results['background_parallax'] = measure(parallax_frame, args.number, args.repeat)
+
+
+def bench_ranking(game, args, results):
+    scene = game.ranking_scene
+    db_manager = game.db_manager
+    scene.draw()
+    results['ranking_draw'] = measure(scene.draw, args.number, args.repeat)
+
+    def cold():
+        db_manager._top_scores = None
+
+    # Sem o cache em memória: cada desenho faz a consulta ao SQLite.
+    results['ranking_draw_cold'] = measure(lambda: (cold(), scene.draw()), max(1, args.number // 4), args.repeat)
+
+
+def bench_save_score(game, args, results):
+    db_manager = game.db_manager
+    count = args.scores
+    batches = []
+
+    def stored_rows():
+        with db_manager._conn_lock:
+            return db_manager._conn.execute("SELECT COUNT(*) FROM scores WHERE name LIKE 'Bench%'").fetchone()[0]
+
+    def save_batch():
+        # Um nome por gravação: o lote inteiro cai no mesmo segundo, e nada pode ser confundido com repetição.
+        batch = len(batches)
+        batches.append(batch)
+        for i in range(count):
+            db_manager.save_score(f"Bench{batch}-{i}", i % 500, "ESTÁTICO (FÁCIL)", b'FBR')
+            # save_score descarta quando a fila enche (o jogo nunca espera); o benchmark espera a gravação.
+            if (i + 1) % SCORE_WRITE_QUEUE_SIZE == 0:
+                db_manager.flush()
+        db_manager.flush()
+
+    before = stored_rows()
+    stats = measure(save_batch, 1, args.repeat)
+    stored = stored_rows() - before
+    if stored != count * len(batches):
+        raise RuntimeError(f"save_score gravou {stored} de {count * len(batches)} pontuações no benchmark.")
+    stats['median_s'] /= count
+    stats['min_s'] /= count
+    stats['number'] = count
+    results['save_score'] = stats
+
+
+def bench_autopilot(args, results):
+    """Um tick headless com a decisão do piloto automático (a busca domina o custo do passo)."""
+    from simulation import HeadlessSimulation
+    from autopilot import autopilot_policy
+
+    run = {}
+
+    def new_run():
+        run['sim'] = HeadlessSimulation.from_settings(seed=args.seed)
+        run['policy'] = autopilot_policy()
+
+    def decide_and_step():
+        sim = run['sim']
+        sim.step(run['policy'](sim))
+
+    results['autopilot_tick'] = measure(decide_and_step, args.number, args.repeat, setup=new_run)
+
+
+def bench_startup(args, results):
+    """Game.__init__ e primeiro frame do menu a frio, contados do início da importação de main.py.
+
+    Um interpretador novo por medição, num diretório com banco vazio.
+    """
+    init_times = []
+    first_frame_times = []
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    for _ in range(args.startup_runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            output = subprocess.run([sys.executable, '-c', STARTUP_SNIPPET], cwd=workdir, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            init_time, first_frame_time = map(float, output.strip().splitlines()[-1].split())
+            init_times.append(init_time)
+            first_frame_times.append(first_frame_time)
+    for name, times in (('game_startup', init_times), ('first_menu_frame', first_frame_times)):
+        results[name] = {'median_s': statistics.median(times), 'min_s': min(times),
+                         'number': 1, 'repeat': args.startup_runs}
+
+
+def compare(results, baseline, threshold):
+    """Imprime a comparação com a linha de base e retorna os nomes das medições que regrediram."""
+    regressions = []
+    print(f"{'benchmark':<28}{'base (ms)':>12}{'atual (ms)':>12}{'razão':>9}")
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<28}{'-':>12}{stats['median_s'] * 1000:>12.4f}{'novo':>9}")
+            continue
+        ratio = stats['median_s'] / base['median_s'] if base['median_s'] else float('inf')
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSÃO"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  melhora"
+        print(f"{name:<28}{base['median_s'] * 1000:>12.4f}{stats['median_s'] * 1000:>12.4f}{ratio:>8.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help="JSON de uma execução anterior para comparar.")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Piora relativa tolerada (0.10 = 10%%).")
+    parser.add_argument('--number', type=int, default=200, help="Chamadas por repetição.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--pipes', type=int, nargs='+', default=[2, 8, 32], help="Pares de canos na tela.")
+    parser.add_argument('--scores', type=int, default=1000, help="Pontuações por lote em save_score.")
+    parser.add_argument('--ranking-rows', type=int, default=100_000)
+    parser.add_argument('--startup-runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # ranking.db e error.log da suíte ficam no diretório temporário.
+        os.chdir(workdir)
+        try:
+            create_legacy_db(os.path.join(workdir, 'ranking.db'), args.ranking_rows, args.seed)
+            import main as game_main
+            game = game_main.Game()
+            game.start_game(args.seed)
+
+            bench_pipes(game, args, results)
+            bench_collisions(game, args, results)
+            bench_render(game, args, results)
+            bench_background(game, args, results)
+            bench_ranking(game, args, results)
+            bench_save_score(game, args, results)
+            game.db_manager.close()
+        finally:
+            os.chdir(cwd)
+    bench_autopilot(args, results)
+    bench_startup(args, results)
+
+    report = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    if baseline is None:
+        for name, stats in results.items():
+            print(f"{name:<28}{stats['median_s'] * 1000:>12.4f} ms  (mín. {stats['min_s'] * 1000:.4f} ms)")
+        print(f"Resultados em {output}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    print(f"Resultados em {output}")
+    if regressions:
+        print(f"{len(regressions)} regressão(ões) acima de {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
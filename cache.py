@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+import pygame
+from settings import TEXT_CACHE_SIZE
+
+
+class SurfaceCache:
+    """Cache de superfícies já escaladas/orientadas, compartilhadas entre sprites."""
+
+    def __init__(self):
+        self._surfaces = {}
+        self._masks = {}
+        self.hits = 0
+        self.misses = 0
+        # Bytes entregues a partir do cache em vez de escalados de novo (cresce a cada acerto, não é memória).
+        self.bytes_reused = 0
+
+    def get_scaled(self, sprite, size, flip_y=False):
+        """Retorna o sprite escalado (e opcionalmente invertido), criando a superfície uma única vez."""
+        key = (id(sprite), size, flip_y)
+        entry = self._surfaces.get(key)
+
+        if entry is not None and entry[0] is sprite:
+            self.hits += 1
+            self.bytes_reused += self._surface_bytes(entry[1])
+            return entry[1]
+
+        self.misses += 1
+        surface = pygame.transform.scale(sprite, size)
+        if flip_y:
+            surface = pygame.transform.flip(surface, False, True)
+
+        # Guarda a referência do sprite original para que o id() não seja reaproveitado.
+        self._surfaces[key] = (sprite, surface)
+        return surface
+
+    def get_pipe_surface(self, pipe_sprite, size, position):
+        """Retorna a superfície do cano para (sprite, tamanho, orientação), criando-a uma única vez."""
+        return self.get_scaled(pipe_sprite, size, position == 'top')
+
+    def get_translucent(self, surface, alpha):
+        """Cópia da superfície com transparência global, compartilhada por todos que a pedem."""
+        key = (id(surface), 'alpha', alpha)
+        entry = self._surfaces.get(key)
+        if entry is not None and entry[0] is surface:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        translucent = surface.copy()
+        translucent.set_alpha(alpha)
+        self._surfaces[key] = (surface, translucent)
+        return translucent
+
+    def get_mask(self, surface):
+        """Máscara de colisão por pixel da superfície, construída uma única vez."""
+        entry = self._masks.get(id(surface))
+        if entry is not None and entry[0] is surface:
+            return entry[1]
+        mask = pygame.mask.from_surface(surface)
+        self._masks[id(surface)] = (surface, mask)
+        return mask
+
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    def stats(self):
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytes_reused': self.bytes_reused,
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+        self._masks.clear()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_reused = 0
+
+
+class TextCache:
+    """Cache LRU de textos renderizados, chaveado por (fonte, texto, cor)."""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Equivalente a font.render(text, antialias, color), renderizando cada combinação uma única vez."""
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def render_number(self, font, number, color, antialias=True):
+        """Retorna os glifos (um por dígito) que compõem o número; só existem 10 superfícies por fonte/cor."""
+        return [self.render(font, digit, color, antialias) for digit in str(number)]
+
+    def stats(self):
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+surface_cache = SurfaceCache()
+text_cache = TextCache()
@@ -0,0 +1,69 @@
+import os
+
+import pygame
+from settings import *
+from cache import surface_cache
+from simulation import RowMask, CollisionMasks
+
+
+class CollisionSystem:
+    """Colisão pássaro x canos em duas fases.
+
+    Fase ampla: os canos estão em ordem de spawn (x crescente), então só o par que cruza
+    a faixa x do pássaro é testado e a busca para no primeiro cano totalmente à direita.
+    Fase estreita: pygame.Mask.overlap com máscaras construídas uma vez por sprite em cache
+    (ou as hitboxes reduzidas, com pixel_perfect=False).
+    """
+
+    def __init__(self, pixel_perfect=PIXEL_PERFECT_COLLISIONS):
+        self.pixel_perfect = pixel_perfect
+        self.narrow_tests = 0
+
+    def first_hit(self, sprite, pipes):
+        """Retorna o primeiro cano que colide com o sprite (Bird ou fantasma), ou None."""
+        rect = sprite.rect
+        left = rect.x
+        right = left + (sprite.image.get_width() if self.pixel_perfect else rect.width)
+
+        for pipe in pipes:
+            pipe_rect = pipe.rect
+            pipe_left = pipe_rect.x
+            if pipe_left >= right:
+                break
+            pipe_width = pipe.image.get_width() if self.pixel_perfect else pipe_rect.width
+            if pipe_left + pipe_width <= left:
+                continue
+
+            self.narrow_tests += 1
+            if self.pixel_perfect:
+                if sprite.mask.overlap(pipe.mask, (pipe_left - left, pipe_rect.y - rect.y)):
+                    return pipe
+            elif rect.colliderect(pipe_rect):
+                return pipe
+        return None
+
+    def hits(self, sprites, pipes):
+        """Lista com o resultado de first_hit para vários sprites (ex.: fantasmas) contra os mesmos canos."""
+        pipes = pipes.sprites() if hasattr(pipes, 'sprites') else list(pipes)
+        return [self.first_hit(sprite, pipes) for sprite in sprites]
+
+
+def build_collision_masks(bird_sprite, pipe_sprite):
+    """Máscaras em Python puro, idênticas às do jogo, para HeadlessSimulation/PopulationSimulator."""
+    bird_image = surface_cache.get_scaled(bird_sprite, (PLAYER_SIZE, PLAYER_SIZE))
+    pipe_size = (PIPE_WIDTH, int(SCREEN_HEIGHT * 1.5))
+    top_image = surface_cache.get_pipe_surface(pipe_sprite, pipe_size, 'top')
+    bottom_image = surface_cache.get_pipe_surface(pipe_sprite, pipe_size, 'bottom')
+    return CollisionMasks(
+        RowMask.from_mask(surface_cache.get_mask(bird_image)),
+        RowMask.from_mask(surface_cache.get_mask(top_image)),
+        RowMask.from_mask(surface_cache.get_mask(bottom_image)),
+    )
+
+
+def load_collision_masks():
+    """Carrega bird.png/pipe.png (sem abrir janela) e monta as máscaras da simulação headless."""
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    bird_sprite = pygame.image.load(os.path.join(base_path, 'assets', 'bird.png'))
+    pipe_sprite = pygame.image.load(os.path.join(base_path, 'assets', 'pipe.png'))
+    return build_collision_masks(bird_sprite, pipe_sprite)
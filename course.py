@@ -0,0 +1,103 @@
+"""Percurso de canos gerado sob demanda a partir de uma semente.
+
+A mesma semente produz o mesmo percurso no jogo (PipeManager), na simulação headless, na
+simulação de população e nos replays.
+
+    python course.py --seed 42 --segments 1000000     # estatísticas sem materializar o percurso
+"""
+import itertools
+import random
+from collections import deque, namedtuple
+
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, PIPE_HITBOX_REDUCTION, COURSE_LOOKAHEAD
+
+CourseSegment = namedtuple('CourseSegment', ['index', 'spawn_tick', 'gap_center'])
+
+GAP_CENTER_MIN = int(SCREEN_HEIGHT * 0.2)
+GAP_CENTER_MAX = int(SCREEN_HEIGHT * 0.8)
+# x da hitbox de um cano no tick em que ele nasce (antes do primeiro movimento).
+SPAWN_X = SCREEN_WIDTH + PIPE_HITBOX_REDUCTION
+
+
+def course_segments(seed, spawn_interval, gap_min=GAP_CENTER_MIN, gap_max=GAP_CENTER_MAX):
+    """Gerador infinito de segmentos: um par de canos a cada spawn_interval ticks."""
+    randint = random.Random(seed).randint
+    for index in itertools.count():
+        yield CourseSegment(index, (index + 1) * spawn_interval, randint(gap_min, gap_max))
+
+
+def segment_x(segment, tick, pipe_speed):
+    """x da hitbox do cano do segmento no fim do tick `tick` (pode estar à direita da tela)."""
+    return int(SPAWN_X - pipe_speed * (tick - segment.spawn_tick + 1))
+
+
+class Course:
+    """Percurso com um buffer de look-ahead: os próximos segmentos já estão gerados e podem ser consultados."""
+
+    def __init__(self, seed, spawn_interval, lookahead=COURSE_LOOKAHEAD):
+        self.seed = seed
+        self.spawn_interval = spawn_interval
+        self._segments = course_segments(seed, spawn_interval)
+        self._buffer = deque(itertools.islice(self._segments, lookahead))
+
+    def peek(self):
+        """Próximo segmento a nascer, sem consumi-lo."""
+        return self._buffer[0]
+
+    def next_segment(self):
+        segment = self._buffer.popleft()
+        self._buffer.append(next(self._segments))
+        return segment
+
+    def upcoming(self, count):
+        """Os `count` próximos segmentos ainda não nascidos (gera mais, se o buffer for menor)."""
+        buffer = self._buffer
+        if count > len(buffer):
+            buffer.extend(itertools.islice(self._segments, count - len(buffer)))
+        return list(itertools.islice(buffer, count))
+
+
+def main():
+    import argparse
+    import time
+
+    from settings import DIFFICULTY_SPEEDS
+    from simulation import spawn_interval_ticks, tick_rate
+
+    parser = argparse.ArgumentParser(description="Estatísticas de um percurso longo, gerado em streaming.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--segments', type=int, default=1_000_000)
+    parser.add_argument('--speed', default="FÁCIL", choices=list(DIFFICULTY_SPEEDS.keys()))
+    args = parser.parse_args()
+    if args.segments < 0:
+        parser.error("--segments não pode ser negativo")
+
+    interval = spawn_interval_ticks(tick_rate(DIFFICULTY_SPEEDS[args.speed]))
+    count = 0
+    total = 0
+    total_sq = 0
+    max_jump = 0
+    previous = None
+    start = time.perf_counter()
+    for segment in itertools.islice(course_segments(args.seed, interval), args.segments):
+        center = segment.gap_center
+        count += 1
+        total += center
+        total_sq += center * center
+        if previous is not None:
+            max_jump = max(max_jump, abs(center - previous))
+        previous = center
+    elapsed = time.perf_counter() - start
+
+    if count == 0:
+        print("0 segmentos: nada a analisar.")
+        return
+    mean = total / count
+    std = max(0.0, total_sq / count - mean * mean) ** 0.5
+    print(f"{count:,} segmentos em {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f}/s), "
+          f"último spawn no tick {segment.spawn_tick:,}")
+    print(f"Centro do vão: média {mean:.1f}, desvio {std:.1f} | maior salto entre vãos seguidos: {max_jump}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,29 +1,109 @@
+import itertools
+import queue
 import sqlite3
+import threading
+import time
+import uuid
 from datetime import datetime
 from logger import GameLogger 
+from settings import SCORE_WRITE_QUEUE_SIZE, SCORE_WRITE_BATCH_SIZE, LEADERBOARD_SIZE, LEADERBOARD_RECHECK_INTERVAL, \
+    IMPORT_CHUNK_SIZE, IMPORT_REBUILD_RATIO, IMPORT_CACHE_MB
+
+SCHEMA_VERSION = 5
+
+# O rowid entra implicitamente no fim de cada índice e desempata a paginação. O índice por modo
+# traz o id explícito antes de nome e dificuldade: cobre as páginas por modo sem mudar a ordem.
+RANKING_INDEXES = {
+    'idx_scores_rank': "idx_scores_rank ON scores (score DESC, timestamp)",
+    'idx_scores_mode': "idx_scores_mode ON scores (mechanic, speed, score DESC, timestamp, id, name, difficulty)",
+    'idx_scores_player': "idx_scores_player ON scores (name, score DESC, timestamp)",
+    'idx_scores_day': "idx_scores_day ON scores (substr(timestamp, 1, 10), score DESC, timestamp)",
+}
+# Id gerado pelo gabinete para cada partida: reenvios ao servidor e reimportações não a duplicam,
+# e partidas iguais no mesmo segundo continuam distintas. Linhas antigas ficam com NULL, fora do índice.
+SUBMISSION_INDEX = "idx_scores_submission ON scores (submission_id) WHERE submission_id IS NOT NULL"
+
+
+def split_difficulty(difficulty):
+    """Separa "MECÂNICA (VELOCIDADE)" em (mecânica, velocidade). A mecânica pode conter parênteses."""
+    mechanic, sep, speed = difficulty.rpartition(" (")
+    if not sep or not speed.endswith(")"):
+        return difficulty, None
+    return mechanic, speed[:-1]
+
 
 class DatabaseManager:
-    def __init__(self):
-        self.db_file = 'ranking.db'
+    def __init__(self, db_file='ranking.db', remote=None):
+        self.db_file = db_file
         self.logger = GameLogger()
         self._initialize_db()
 
+        # Ranking compartilhado opcional (endereço do leaderboard_server.py): as pontuações continuam
+        # sendo gravadas no banco local, e o top exibido vem do servidor enquanto ele responder.
+        self.remote = None
+        if remote:
+            from leaderboard_client import LeaderboardClient
+            self.remote = LeaderboardClient(remote)
+
+        # Conexão única compartilhada entre a thread de escrita e as leituras do ranking.
+        # Como o PRAGMA data_version só muda com commits de *outras* conexões, as gravações
+        # deste processo não invalidam o cache do ranking; só as de outros processos.
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error as e:
+            self.logger.log_error(f"Falha ao abrir conexão persistente do DB: {e}")
+
+        self._top_scores = None
+        self._in_flight = []
+        self._data_version = None
+        self._last_version_check = 0.0
+        self.leaderboard_queries = 0
+
+        self._write_queue = queue.Queue(maxsize=SCORE_WRITE_QUEUE_SIZE)
+        self._writer = threading.Thread(target=self._writer_loop, name="ScoreWriter", daemon=True)
+        self._writer.start()
+
     def _initialize_db(self):
         """Cria a tabela de scores se ela não existir e garante a integridade da conexão."""
         conn = None
         try:
             conn = sqlite3.connect(self.db_file)
             cursor = conn.cursor()
+            # WAL permite que o ranking leia enquanto a thread de escrita grava.
+            cursor.execute("PRAGMA journal_mode=WAL")
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS scores (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL,
                     score INTEGER NOT NULL,
                     difficulty TEXT NOT NULL,
-                    timestamp TEXT NOT NULL
+                    timestamp TEXT NOT NULL,
+                    mechanic TEXT,
+                    speed TEXT,
+                    replay BLOB,
+                    submission_id TEXT
                 )
             """)
             conn.commit()
+
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self._migrate_v1(conn)
+            if version < 2:
+                self._migrate_v2(conn)
+            if version < 3:
+                self._migrate_v3(conn)
+            has_score_key = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_scores_key'").fetchone()
+            if version < 4 or has_score_key:
+                self._migrate_v4(conn)
+            if version < 5:
+                self._migrate_v5(conn)
+
             self.logger.log_info("Banco de dados do ranking inicializado com sucesso.")
         except sqlite3.Error as e:
             self.logger.log_error(f"Erro ao inicializar o banco de dados: {e}")
@@ -31,51 +111,500 @@ class DatabaseManager:
             if conn:
                 conn.close()
 
-    def save_score(self, name, score, difficulty):
-        """Salva a pontuação no banco de dados e garante o commit."""
+    def _migrate_v1(self, conn):
+        """Separa mecânica e velocidade em colunas próprias e cria os índices do ranking."""
+        cursor = conn.cursor()
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(scores)")}
+        with conn:
+            if 'mechanic' not in columns:
+                cursor.execute("ALTER TABLE scores ADD COLUMN mechanic TEXT")
+            if 'speed' not in columns:
+                cursor.execute("ALTER TABLE scores ADD COLUMN speed TEXT")
+
+            rows = cursor.execute("SELECT DISTINCT difficulty FROM scores WHERE mechanic IS NULL").fetchall()
+            cursor.executemany("UPDATE scores SET mechanic = ?, speed = ? WHERE difficulty = ? AND mechanic IS NULL",
+                               [split_difficulty(difficulty) + (difficulty,) for (difficulty,) in rows])
+
+            for index in RANKING_INDEXES.values():
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index}")
+            cursor.execute("PRAGMA user_version = 1")
+        cursor.execute("ANALYZE")
+        self.logger.log_info("Banco de dados migrado para a versão 1 do esquema.")
+
+    def _migrate_v2(self, conn):
+        """Adiciona a coluna com o replay compacto (semente + ticks de flap) de cada partida."""
+        cursor = conn.cursor()
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(scores)")}
+        with conn:
+            if 'replay' not in columns:
+                cursor.execute("ALTER TABLE scores ADD COLUMN replay BLOB")
+            cursor.execute("PRAGMA user_version = 2")
+        self.logger.log_info("Banco de dados migrado para a versão 2 do esquema.")
+
+    def _migrate_v3(self, conn):
+        """Recria o índice por modo cobrindo nome e dificuldade (as páginas por modo não leem a tabela)."""
+        cursor = conn.cursor()
+        row = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_scores_mode'").fetchone()
+        with conn:
+            # Bancos criados agora já saem da versão 1 com o índice novo.
+            if row is None or row[0] != f"CREATE INDEX {RANKING_INDEXES['idx_scores_mode']}":
+                cursor.execute("DROP INDEX IF EXISTS idx_scores_mode")
+                cursor.execute(f"CREATE INDEX {RANKING_INDEXES['idx_scores_mode']}")
+            cursor.execute("PRAGMA user_version = 3")
+        self.logger.log_info("Banco de dados migrado para a versão 3 do esquema.")
+
+    def _migrate_v4(self, conn):
+        """Desfaz a chave única (nome, pontuação, dificuldade, data) e volta ao índice por jogador.
+
+        A chave descartava partidas reais iguais no mesmo segundo (todas as locais se chamam "Player");
+        a deduplicação fica só na importação. Nenhuma linha é removida.
+        """
+        cursor = conn.cursor()
+        with conn:
+            cursor.execute("DROP INDEX IF EXISTS idx_scores_key")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {RANKING_INDEXES['idx_scores_player']}")
+            cursor.execute("PRAGMA user_version = 4")
+        self.logger.log_info("Banco de dados migrado para a versão 4 do esquema.")
+
+    def _migrate_v5(self, conn):
+        """Adiciona o id de envio de cada partida, único quando presente."""
+        cursor = conn.cursor()
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(scores)")}
+        with conn:
+            if 'submission_id' not in columns:
+                cursor.execute("ALTER TABLE scores ADD COLUMN submission_id TEXT")
+            cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {SUBMISSION_INDEX}")
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.logger.log_info(f"Banco de dados migrado para a versão {SCHEMA_VERSION} do esquema.")
+
+    def save_score(self, name, score, difficulty, replay=None):
+        """Enfileira a pontuação (e o replay codificado, se houver) para a thread de escrita; nunca bloqueia o loop do jogo."""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         if name == "Player Temp":
             name = "Player"
 
-        conn = None
+        row = (name, score, difficulty, timestamp, replay, uuid.uuid4().hex)
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO scores (name, score, difficulty, timestamp)
-                VALUES (?, ?, ?, ?)
-            """, (name, score, difficulty, timestamp))
-            
-            conn.commit() 
-            self.logger.log_info(f"Pontuação salva: {score} ({difficulty})")
+            self._write_queue.put_nowait(row)
+        except queue.Full:
+            self.logger.log_error(f"Fila de gravação cheia, pontuação descartada: {score} ({difficulty})")
+            return
+
+        self._update_cached_leaderboard(row)
+        if self.remote is not None:
+            self.remote.submit(row)
+
+    def _update_cached_leaderboard(self, row):
+        """Insere a pontuação no ranking em memória, se ela se qualificar para o top."""
+        if self._top_scores is None:
+            return
+        if len(self._top_scores) >= LEADERBOARD_SIZE and row[1] <= self._top_scores[-1][1]:
+            return
+        self._top_scores.append(row[:4])
+        self._top_scores.sort(key=lambda entry: (-entry[1], entry[3]))
+        del self._top_scores[LEADERBOARD_SIZE:]
+
+    def _writer_loop(self):
+        """Thread de escrita: grava as pontuações em lotes na conexão persistente."""
+        conn = self._conn
+        running = True
+        while running:
+            batch = []
+            item = self._write_queue.get()
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= SCORE_WRITE_BATCH_SIZE:
+                    break
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if item is None:
+                running = False
+
+            if batch and conn:
+                self._write_batch(conn, batch)
+
+            for _ in range(len(batch) + (0 if running else 1)):
+                self._write_queue.task_done()
+
+    def _write_batch(self, conn, batch):
+        self._in_flight = batch
+        try:
+            with self._conn_lock:
+                try:
+                    with conn:
+                        conn.executemany("""
+                            INSERT INTO scores (name, score, difficulty, timestamp, mechanic, speed, replay, submission_id)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """, [row[:4] + split_difficulty(row[2]) + row[4:] for row in batch])
+                    # Os commits desta conexão não mudam o data_version, e um top lido entre o get() da fila e
+                    # _in_flight pode ter perdido o lote: a próxima leitura do ranking volta a consultar o banco.
+                    self._data_version = None
+                    self._last_version_check = 0.0
+                finally:
+                    self._in_flight = []
+            for name, score, difficulty, timestamp, replay, submission_id in batch:
+                self.logger.log_info(f"Pontuação salva: {score} ({difficulty})")
         except sqlite3.Error as e:
-            self.logger.log_error(f"Falha ao salvar pontuação no DB: {e}")
-            if conn:
-                conn.rollback()
-        finally:
-            if conn:
-                conn.close()
+            self.logger.log_error(f"Falha ao salvar {len(batch)} pontuação(ões) no DB: {e}")
+
+    def flush(self):
+        """Aguarda até que todas as pontuações enfileiradas tenham sido gravadas."""
+        self._write_queue.join()
+
+    def close(self):
+        """Grava o que estiver pendente e encerra a thread de escrita (e a conexão com o ranking compartilhado)."""
+        if self.remote is not None:
+            self.remote.close()
+        if self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join()
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def _read_data_version(self):
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _query_top_scores(self):
+        self.leaderboard_queries += 1
+        cursor = self._conn.execute("""
+            SELECT name, score, difficulty, timestamp 
+            FROM scores 
+            ORDER BY score DESC, timestamp ASC 
+            LIMIT ?
+        """, (LEADERBOARD_SIZE,))
+        return cursor.fetchall()
 
     def get_top_scores(self):
-        """Recupera as 10 melhores pontuações para exibição no ranking."""
-        scores = []
-        conn = None
+        """Recupera as 10 melhores pontuações para exibição no ranking (do cache, sempre que possível)."""
+        if self.remote is not None:
+            top = self.remote.top_scores()
+            if top is not None:
+                return top
+
+        if self._conn is None:
+            return []
+
+        now = time.monotonic()
+        if self._top_scores is not None and now - self._last_version_check < LEADERBOARD_RECHECK_INTERVAL:
+            return self._top_scores
+
+        # Com o cache já preenchido, nunca espera a thread de escrita: se ela estiver gravando, tenta depois.
+        if not self._conn_lock.acquire(blocking=self._top_scores is None):
+            return self._top_scores
+
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT name, score, difficulty, timestamp 
-                FROM scores 
-                ORDER BY score DESC, timestamp ASC 
-                LIMIT 10
-            """)
-            scores = cursor.fetchall()
+            self._last_version_check = now
+            data_version = self._read_data_version()
+            if self._top_scores is None or data_version != self._data_version:
+                self._top_scores = self._query_top_scores()
+                self._data_version = data_version
+                # Pontuações ainda não gravadas pela thread de escrita continuam valendo no ranking.
+                with self._write_queue.mutex:
+                    pending = [row for row in self._write_queue.queue if row is not None]
+                for row in self._in_flight + pending:
+                    self._update_cached_leaderboard(row)
         except sqlite3.Error as e:
             self.logger.log_error(f"Falha ao buscar ranking no DB: {e}")
-            return []
+            return self._top_scores or []
         finally:
-            if conn:
-                conn.close()
+            self._conn_lock.release()
         
-        return scores
\ No newline at end of file
+        return self._top_scores
+
+    def get_scores_page(self, mechanic=None, speed=None, day=None, player=None, after=None, limit=LEADERBOARD_SIZE):
+        """Página do ranking com filtros opcionais por modo, dia ('AAAA-MM-DD') e jogador.
+
+        A paginação é por chave (keyset): passe em `after` o cursor retornado pela página
+        anterior. Retorna (linhas, próximo_cursor); o cursor é None na última página.
+        Com só a mecânica ou só a velocidade, a página percorre idx_scores_rank em ordem e lê
+        cada linha para filtrar: é rápida enquanto o modo for comum entre as pontuações.
+        """
+        if self._conn is None:
+            return [], None
+
+        where = []
+        params = []
+        if mechanic is not None:
+            where.append("mechanic = ?")
+            params.append(mechanic)
+        if speed is not None:
+            where.append("speed = ?")
+            params.append(speed)
+        if day is not None:
+            where.append("substr(timestamp, 1, 10) = ?")
+            params.append(day)
+        if player is not None:
+            where.append("name = ?")
+            params.append(player)
+        if after is not None:
+            score, timestamp, row_id = after
+            where.append("score <= ? AND (score < ? OR timestamp > ? OR (timestamp = ? AND id > ?))")
+            params.extend((score, score, timestamp, timestamp, row_id))
+
+        sql = "SELECT name, score, difficulty, timestamp, id FROM scores"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY score DESC, timestamp ASC, id ASC LIMIT ?"
+        params.append(limit)
+
+        try:
+            with self._conn_lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            self.logger.log_error(f"Falha ao paginar ranking no DB: {e}")
+            return [], None
+
+        next_cursor = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_cursor = (last[1], last[3], last[4])
+        return [row[:4] for row in rows], next_cursor
+
+    def get_rank(self, score, mechanic=None, speed=None):
+        """Posição que a pontuação ocupa no ranking geral ou filtrado por mecânica e/ou velocidade, contando entradas de índice.
+
+        Sem filtro, ou com mecânica e velocidade, a contagem lê só idx_scores_rank ou idx_scores_mode.
+        Só com a velocidade, o SQLite salta pelas poucas mecânicas de idx_scores_mode (skip-scan, que
+        depende das estatísticas do ANALYZE da migração). Só com a mecânica não há índice que comece por
+        (mechanic, score): o caminho mais lento percorre idx_scores_rank e lê a linha de cada pontuação
+        maior (cerca de 50 ms para 12 mil pontuações maiores num banco de 300 mil). Um índice a mais
+        para esse caso pesaria em toda gravação e na importação, então ele fica assim.
+        """
+        if self._conn is None:
+            return None
+
+        where = []
+        params = []
+        if mechanic is not None:
+            where.append("mechanic = ?")
+            params.append(mechanic)
+        if speed is not None:
+            where.append("speed = ?")
+            params.append(speed)
+        where.append("score > ?")
+        params.append(score)
+        sql = "SELECT COUNT(*) FROM scores WHERE " + " AND ".join(where)
+
+        try:
+            with self._conn_lock:
+                return self._conn.execute(sql, params).fetchone()[0] + 1
+        except sqlite3.Error as e:
+            self.logger.log_error(f"Falha ao calcular posição no ranking: {e}")
+            return None
+
+    def get_replays(self, limit=None, mechanic=None, speed=None):
+        """Lista (id, nome, pontuação, replay) das partidas com replay gravado, da maior pontuação para a menor."""
+        if self._conn is None:
+            return []
+
+        where = ["replay IS NOT NULL"]
+        params = []
+        if mechanic is not None:
+            where.append("mechanic = ?")
+            params.append(mechanic)
+        if speed is not None:
+            where.append("speed = ?")
+            params.append(speed)
+
+        sql = "SELECT id, name, score, replay FROM scores WHERE " + " AND ".join(where)
+        sql += " ORDER BY score DESC, timestamp ASC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            with self._conn_lock:
+                return self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            self.logger.log_error(f"Falha ao buscar replays no DB: {e}")
+            return []
+
+    def iter_scores(self):
+        """Todas as linhas (nome, pontuação, dificuldade, data, replay, id de envio) em ordem de gravação, sem carregá-las na memória.
+
+        Usa uma conexão própria: no modo WAL a exportação lê um retrato consistente do banco
+        sem bloquear a thread de escrita.
+        """
+        conn = sqlite3.connect(self.db_file)
+        try:
+            yield from conn.execute("SELECT name, score, difficulty, timestamp, replay, submission_id FROM scores ORDER BY id")
+        finally:
+            conn.close()
+
+    def import_scores(self, rows, chunk_size=IMPORT_CHUNK_SIZE):
+        """Grava linhas (nome, pontuação, dificuldade, data, replay, id de envio) vindas de qualquer iterável, sem guardá-las na memória.
+
+        As linhas vão cruas para uma tabela temporária sem índices, em transações de `chunk_size`
+        linhas (executemany). Depois, um único INSERT ... SELECT passa para o ranking a primeira
+        ocorrência de cada (nome, pontuação, dificuldade, data) que ainda não está no banco; com id
+        de envio, só é repetida a linha com o mesmo id. Retorna (linhas lidas, linhas inseridas).
+        """
+        if self._conn is None:
+            return 0, 0
+
+        self.flush()
+        conn = self._conn
+        read = 0
+        with self._conn_lock:
+            cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+            try:
+                conn.execute(f"PRAGMA cache_size = {-IMPORT_CACHE_MB * 1024}")
+                conn.execute("""
+                    CREATE TEMP TABLE import_rows (
+                        name TEXT NOT NULL, score INTEGER NOT NULL, difficulty TEXT NOT NULL, timestamp TEXT NOT NULL,
+                        replay BLOB, submission_id TEXT
+                    )
+                """)
+                rows = iter(rows)
+                while True:
+                    chunk = list(itertools.islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    with conn:
+                        conn.executemany("INSERT INTO import_rows VALUES (?, ?, ?, ?, ?, ?)", chunk)
+                    read += len(chunk)
+
+                with conn:
+                    inserted = self._merge_import(conn, read)
+            except sqlite3.Error as e:
+                self.logger.log_error(f"Falha ao importar pontuações: {e}")
+                raise
+            finally:
+                for table in ('import_rows', 'import_modes', 'import_new'):
+                    conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+                conn.execute(f"PRAGMA cache_size = {cache_size}")
+
+        self._top_scores = None
+        self.logger.log_info(f"Importação: {read} linha(s) lida(s), {inserted} inserida(s).")
+        return read, inserted
+
+    def _merge_import(self, conn, count):
+        """Passa de import_rows para scores as linhas novas; roda dentro da transação de import_scores."""
+        # Mecânica e velocidade saem de uma tabela com as poucas dificuldades distintas da entrada.
+        conn.execute("CREATE TEMP TABLE import_modes (difficulty TEXT PRIMARY KEY, mechanic TEXT, speed TEXT)")
+        conn.executemany("INSERT INTO import_modes VALUES (?, ?, ?)",
+                         [(difficulty,) + split_difficulty(difficulty)
+                          for (difficulty,) in conn.execute("SELECT DISTINCT difficulty FROM import_rows")])
+
+        # Um só agrupamento deduplica a entrada: com MIN(rowid), as colunas soltas (o replay) vêm da
+        # primeira ocorrência, e a ordem de gravação segue a do arquivo.
+        new_rows = """
+            SELECT i.name, i.score, i.difficulty, i.timestamp, m.mechanic, m.speed, i.replay, i.submission_id
+            FROM (
+                SELECT name, score, difficulty, timestamp, replay, submission_id, MIN(rowid) AS first FROM import_rows
+                GROUP BY name, score, difficulty, timestamp, submission_id
+            ) AS i JOIN import_modes AS m ON m.difficulty = i.difficulty
+        """
+        existing = conn.execute("SELECT MAX(id) FROM scores").fetchone()[0] or 0
+        if existing:
+            # A busca no banco usa idx_scores_player (nome, pontuação, data).
+            new_rows += """
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM scores AS s
+                    WHERE s.name = i.name AND s.score = i.score AND s.timestamp = i.timestamp AND s.difficulty = i.difficulty
+                      AND s.submission_id IS i.submission_id
+                )
+            """
+        new_rows += " ORDER BY i.first"
+
+        # Inserir em ordem aleatória nos índices custa bem mais do que recriá-los ordenados: em importações
+        # grandes em relação ao banco (IMPORT_REBUILD_RATIO), eles saem e voltam depois da carga. As linhas
+        # novas são separadas antes, enquanto idx_scores_player ainda atende a busca no banco. O índice dos
+        # ids de envio fica: o OR IGNORE descarta um id que já está no banco com outros dados.
+        rebuild = count > existing * IMPORT_REBUILD_RATIO
+        if rebuild and existing:
+            conn.execute(f"CREATE TEMP TABLE import_new AS {new_rows}")
+            new_rows = "SELECT * FROM import_new"
+        if rebuild:
+            for name in RANKING_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+        inserted = conn.execute(f"""
+            INSERT OR IGNORE INTO scores (name, score, difficulty, timestamp, mechanic, speed, replay, submission_id)
+            {new_rows}
+        """).rowcount
+        if rebuild:
+            for index in RANKING_INDEXES.values():
+                conn.execute(f"CREATE INDEX {index}")
+        return inserted
+
+    def prune(self, keep):
+        """Mantém só as `keep` melhores pontuações de cada modo (mecânica, velocidade) e compacta o arquivo.
+
+        Retorna a quantidade de linhas removidas.
+        """
+        if self._conn is None:
+            return 0
+
+        self.flush()
+        conn = self._conn
+        with self._conn_lock:
+            with conn:
+                removed = conn.execute("""
+                    DELETE FROM scores WHERE id IN (
+                        SELECT id FROM (
+                            SELECT id, ROW_NUMBER() OVER (
+                                PARTITION BY mechanic, speed ORDER BY score DESC, timestamp ASC, id ASC
+                            ) AS position
+                            FROM scores
+                        ) WHERE position > ?
+                    )
+                """, (keep,)).rowcount
+            # VACUUM não roda dentro de transação; o checkpoint devolve ao disco o espaço do WAL.
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("ANALYZE")
+
+        self._top_scores = None
+        self.logger.log_info(f"Manutenção: {removed} pontuação(ões) além das {keep} melhores por modo removida(s).")
+        return removed
+
+    def insert_new_scores(self, rows):
+        """Grava já, numa única transação, as linhas (nome, pontuação, dificuldade, data, replay, id de envio) ainda não gravadas.
+
+        Usado pelo servidor de ranking: a linha é repetida só se o id de envio já estiver no banco,
+        então reenviar um lote cuja confirmação se perdeu não duplica pontuações, e partidas iguais
+        de gabinetes diferentes continuam separadas. Retorna uma lista de bool (linha inserida?)
+        alinhada com `rows`.
+        """
+        if self._conn is None:
+            raise sqlite3.OperationalError("banco do ranking indisponível")
+
+        modes = {}
+        inserted = []
+        with self._conn_lock:
+            with self._conn:
+                cursor = self._conn.cursor()
+                for name, score, difficulty, timestamp, replay, submission_id in rows:
+                    mode = modes.get(difficulty)
+                    if mode is None:
+                        mode = modes[difficulty] = split_difficulty(difficulty)
+                    cursor.execute("""
+                        INSERT OR IGNORE INTO scores (name, score, difficulty, timestamp, mechanic, speed, replay, submission_id)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (name, score, difficulty, timestamp) + mode + (replay, submission_id))
+                    inserted.append(cursor.rowcount == 1)
+        return inserted
+
+    def get_top_by_mode(self, depth):
+        """As `depth` melhores (nome, pontuação, dificuldade, data, mecânica, velocidade) de cada modo, na ordem do ranking."""
+        if self._conn is None:
+            return []
+
+        try:
+            with self._conn_lock:
+                return self._conn.execute("""
+                    SELECT name, score, difficulty, timestamp, mechanic, speed FROM (
+                        SELECT *, ROW_NUMBER() OVER (
+                            PARTITION BY mechanic, speed ORDER BY score DESC, timestamp ASC, id ASC
+                        ) AS position
+                        FROM scores
+                    ) WHERE position <= ?
+                    ORDER BY score DESC, timestamp ASC, id ASC
+                """, (depth,)).fetchall()
+        except sqlite3.Error as e:
+            self.logger.log_error(f"Falha ao carregar o ranking por modo: {e}")
+            return []
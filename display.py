@@ -0,0 +1,142 @@
+import math
+import os
+
+import pygame
+from settings import *
+
+
+class Display:
+    """Quadro de desenho em resolução fixa e sua apresentação na tela real.
+
+    O jogo desenha sempre em `target`, de tamanho SCREEN_WIDTH x SCREEN_HEIGHT vezes
+    RENDER_SCALE, então o custo de preencher e desenhar não depende da resolução da saída:
+      - 'window': janela do tamanho de `target`, sem escala (o padrão em desktop).
+      - 'scaled': pygame.SCALED; `target` é a própria janela e o SDL escala o quadro na GPU.
+      - 'blit': janela no tamanho da saída e transform.scale por software (com tarjas pretas
+        se a proporção for diferente), só das regiões que mudaram.
+    As cenas estáticas (menu, ranking, game over) desenham em coordenadas lógicas em
+    `scene_surface`, que só é reduzida para `target` quando a cena muda.
+
+    GAME_RENDER_SCALE=0.5, GAME_DISPLAY_MODE=blit e GAME_FULLSCREEN=1 sobrepõem settings.py.
+    """
+
+    def __init__(self, scale=RENDER_SCALE, mode=DISPLAY_MODE, fullscreen=DISPLAY_FULLSCREEN, window_size=DISPLAY_SIZE):
+        self.scale = scale
+        self.logical_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.render_size = (max(1, round(SCREEN_WIDTH * scale)), max(1, round(SCREEN_HEIGHT * scale)))
+        flags = pygame.FULLSCREEN if fullscreen else 0
+
+        self.window = None
+        if mode == 'window':
+            self.window = pygame.display.set_mode(self.render_size, flags)
+        elif mode == 'scaled':
+            try:
+                self.window = pygame.display.set_mode(self.render_size, flags | pygame.SCALED)
+            except pygame.error:
+                # Sem renderizador do SDL disponível: cai para a escala por software.
+                mode = 'blit'
+        if mode == 'blit':
+            if window_size is None:
+                window_size = pygame.display.get_desktop_sizes()[0] if fullscreen else self.logical_size
+            self.window = pygame.display.set_mode(window_size, flags)
+        self.mode = mode
+
+        if self.window.get_size() == self.render_size:
+            self.target = self.window
+            self._output = None
+        else:
+            self.target = pygame.Surface(self.render_size).convert()
+            self._output = self._fit_output()
+            self._output_offset = self._output.get_abs_offset()
+            self._blocks = self._scale_blocks()
+
+        self.scene_surface = self.target if self.render_size == self.logical_size else \
+            pygame.Surface(self.logical_size).convert()
+
+    @classmethod
+    def from_env(cls):
+        scale = float(os.environ.get('GAME_RENDER_SCALE', RENDER_SCALE))
+        mode = os.environ.get('GAME_DISPLAY_MODE', DISPLAY_MODE)
+        fullscreen = os.environ.get('GAME_FULLSCREEN', '1' if DISPLAY_FULLSCREEN else '0') not in ('', '0')
+        return cls(scale, mode, fullscreen)
+
+    def _fit_output(self):
+        """Área da janela que recebe o quadro escalado, mantendo a proporção."""
+        window_w, window_h = self.window.get_size()
+        render_w, render_h = self.render_size
+        factor = min(window_w / render_w, window_h / render_h)
+        size = (max(1, int(render_w * factor)), max(1, int(render_h * factor)))
+        rect = pygame.Rect((0, 0), size)
+        rect.center = (window_w // 2, window_h // 2)
+        self.window.fill(BLACK)
+        return self.window.subsurface(rect)
+
+    def _scale_blocks(self):
+        """Menores blocos (largura, altura) do quadro e da saída que se correspondem pixel a pixel na escala.
+
+        Escalar um bloco alinhado dá os mesmos pixels que escalar o quadro inteiro (vizinho mais próximo).
+        """
+        (render_w, render_h), (output_w, output_h) = self.render_size, self._output.get_size()
+        gx, gy = math.gcd(render_w, output_w), math.gcd(render_h, output_h)
+        return (render_w // gx, render_h // gy), (output_w // gx, output_h // gy)
+
+    def present(self, rects=None):
+        """Mostra o quadro inteiro, ou só as regiões informadas (em coordenadas de target).
+
+        Com rects vazio nada mudou e nada é apresentado. No modo 'blit' só os blocos alinhados que
+        contêm as regiões são escalados para a saída.
+        """
+        if rects is not None and not rects:
+            return
+        if self._output is None:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+        if rects is not None:
+            regions = self._scaled_regions(rects)
+            if regions is not None:
+                target, output = self.target, self._output
+                for source, dest in regions:
+                    pygame.transform.scale(target.subsurface(source), dest.size, output.subsurface(dest))
+                pygame.display.update([dest.move(self._output_offset) for _, dest in regions])
+                return
+        pygame.transform.scale(self.target, self._output.get_size(), self._output)
+        pygame.display.flip()
+
+    def _scaled_regions(self, rects):
+        """Pares (região do quadro, região da saída) alinhados aos blocos; None se escalar tudo custar menos."""
+        (block_w, block_h), (out_w, out_h) = self._blocks
+        bounds = self.target.get_rect()
+        blocks = []
+        for rect in rects:
+            rect = bounds.clip(rect)
+            if not rect:
+                continue
+            left, top = rect.left // block_w, rect.top // block_h
+            right, bottom = -(-rect.right // block_w), -(-rect.bottom // block_h)
+            blocks.append(pygame.Rect(left, top, right - left, bottom - top))
+        # A posição anterior e a atual de um sprite quase se cobrem: juntas, são escaladas uma vez só.
+        merged = []
+        for rect in blocks:
+            index = rect.collidelist(merged)
+            while index != -1:
+                other = merged[index]
+                union = rect.union(other)
+                if union.width * union.height > rect.width * rect.height + other.width * other.height:
+                    break
+                merged.pop(index)
+                rect = union
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        if sum(rect.width * rect.height for rect in merged) * block_w * block_h >= bounds.width * bounds.height:
+            return None
+        return [(pygame.Rect(rect.x * block_w, rect.y * block_h, rect.width * block_w, rect.height * block_h),
+                 pygame.Rect(rect.x * out_w, rect.y * out_h, rect.width * out_w, rect.height * out_h)) for rect in merged]
+
+    def present_scene(self):
+        """Leva a cena desenhada em coordenadas lógicas para target e mostra o quadro inteiro."""
+        if self.scene_surface is not self.target:
+            pygame.transform.smoothscale(self.scene_surface, self.render_size, self.target)
+        self.present()
@@ -0,0 +1,85 @@
+import struct
+import zlib
+from array import array
+from itertools import islice
+
+from settings import *
+from cache import surface_cache
+from replay import Replay, replay_positions
+
+
+class GhostTrack:
+    """Altura do pássaro de um replay por tick, calculada sob demanda e guardada num array."""
+
+    def __init__(self, replay):
+        self.score = replay.score
+        self.end_tick = replay.end_tick
+        self.ys = array('h', [BIRD_START_POS[1]])
+        self._positions = replay_positions(replay)
+
+    def ensure(self, tick):
+        """Garante que as posições até `tick` (ou até o fim da partida) já estão no array."""
+        missing = min(tick, self.end_tick) + 1 - len(self.ys)
+        if missing > 0:
+            self.ys.extend(y for _, y in islice(self._positions, missing))
+
+
+class GhostRace:
+    """Fantasmas translúcidos dos melhores replays, correndo no mesmo percurso do jogador.
+
+    Nenhum fantasma é um sprite Bird: cada um é só um array de alturas, estendido a cada
+    frame até GHOST_LOOKAHEAD_TICKS à frente, e todos usam a mesma superfície translúcida.
+    """
+
+    def __init__(self, replays, bird_image, lookahead=GHOST_LOOKAHEAD_TICKS):
+        self.tracks = [GhostTrack(replay) for replay in replays]
+        self.image = surface_cache.get_translucent(bird_image, GHOST_ALPHA)
+        self.x = BIRD_START_POS[0]
+        self.lookahead = lookahead
+        self.advance(0)
+
+    def advance(self, tick):
+        target = tick + self.lookahead
+        for track in self.tracks:
+            track.ensure(target)
+
+    def alive(self, tick):
+        return sum(1 for track in self.tracks if tick <= track.end_tick)
+
+    def blit_items(self, tick, alpha):
+        """Pares (superfície, posição) dos fantasmas ainda em jogo, interpolados entre ticks."""
+        image = self.image
+        x = self.x
+        items = []
+        for track in self.tracks:
+            if tick > track.end_tick:
+                continue
+            ys = track.ys
+            y = ys[tick]
+            prev_y = ys[tick - 1] if tick else y
+            items.append((image, (x, prev_y + (y - prev_y) * alpha)))
+        return items
+
+
+def course_seed(mechanic, speed):
+    """Semente fixa do percurso da Corrida Fantasma no modo (a mesma em qualquer execução)."""
+    return (zlib.crc32(f"{mechanic}|{speed}".encode('utf-8')) ^ GHOST_COURSE_SEED) & 0xFFFFFFFF
+
+
+def select_ghosts(rows, seed, count=GHOST_COUNT):
+    """Os `count` melhores replays feitos no percurso `seed`.
+
+    rows: linhas (id, nome, pontuação, replay) já ordenadas por pontuação, como em
+    DatabaseManager.get_replays. Replays de outros percursos são pulados sem serem decodificados.
+    """
+    replays = []
+    for row_id, name, score, data in rows:
+        try:
+            if Replay.read_seed(data) != seed:
+                continue
+            replays.append(Replay.decode(data))
+        except (ValueError, IndexError, struct.error):
+            continue
+        if len(replays) >= count:
+            break
+    return replays
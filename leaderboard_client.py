@@ -0,0 +1,213 @@
+"""Cliente do ranking compartilhado (leaderboard_server.py) e o protocolo entre os dois.
+
+O protocolo é JSON, uma mensagem por linha, uma resposta por pedido:
+
+    {"op": "submit", "scores": [[nome, pontuação, dificuldade, data, replay em base64 ou null, id do envio], ...]}
+    -> {"ok": true, "inserted": 3}
+    {"op": "top", "limit": 10, "mechanic": null, "speed": null}
+    -> {"ok": true, "scores": [[nome, pontuação, dificuldade, data], ...]}
+
+O id do envio é gerado pelo gabinete (uuid4, em DatabaseManager.save_score) e identifica a
+partida: o servidor grava cada id uma vez só. Erros voltam como {"ok": false, "error": "..."}.
+"""
+import base64
+import collections
+import itertools
+import json
+import socket
+import threading
+import time
+
+from logger import GameLogger
+from settings import LEADERBOARD_SIZE, LEADERBOARD_RECHECK_INTERVAL, LEADERBOARD_TIMEOUT, LEADERBOARD_RETRY_MAX, \
+    LEADERBOARD_OUTBOX_SIZE, LEADERBOARD_SUBMIT_BATCH
+
+
+def parse_address(address):
+    """"tcp://host:porta", "host:porta" ou "unix:/caminho" -> ('tcp', (host, porta)) ou ('unix', caminho)."""
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    if address.startswith('tcp://'):
+        address = address[len('tcp://'):]
+    host, sep, port = address.rpartition(':')
+    if not sep:
+        raise ValueError(f"Endereço do ranking inválido: {address!r}")
+    return 'tcp', (host or '127.0.0.1', int(port))
+
+
+def encode_message(message):
+    return json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def encode_score(row):
+    name, score, difficulty, timestamp, replay, submission_id = row
+    return [name, score, difficulty, timestamp, base64.b64encode(replay).decode('ascii') if replay is not None else None,
+            submission_id]
+
+
+def decode_score(item):
+    name, score, difficulty, timestamp, replay, submission_id = item
+    if not submission_id:
+        raise ValueError("pontuação sem id de envio")
+    return (str(name), int(score), str(difficulty), str(timestamp),
+            base64.b64decode(replay) if replay is not None else None, str(submission_id))
+
+
+class LeaderboardError(Exception):
+    pass
+
+
+class LeaderboardClient:
+    """Conexão persistente com o servidor de ranking, mantida por uma thread própria.
+
+    `submit` só coloca a pontuação na fila de saída e nunca bloqueia o jogo. A thread envia a
+    fila em lotes e só tira as pontuações dela depois da confirmação do servidor. Se o servidor
+    estiver fora do ar, a fila espera (até LEADERBOARD_OUTBOX_SIZE pontuações, descartando as
+    mais antigas). A reconexão é tentada com espera crescente, até LEADERBOARD_RETRY_MAX. O
+    servidor ignora ids de envio que já gravou, então reenviar um lote não duplica nada. O top do
+    ranking é atualizado a cada LEADERBOARD_RECHECK_INTERVAL enquanto houver conexão.
+    """
+
+    def __init__(self, address, timeout=LEADERBOARD_TIMEOUT, outbox_size=LEADERBOARD_OUTBOX_SIZE):
+        self.address = address
+        self.family, self.target = parse_address(address)
+        self.timeout = timeout
+        self.logger = GameLogger()
+
+        self._outbox = collections.deque(maxlen=outbox_size)
+        self._cond = threading.Condition()
+        self._closing = False
+        self._sock = None
+        self._reader = None
+        self._top = None
+        self.connected = False
+        self.submitted = 0
+        self.dropped = 0
+
+        self._thread = threading.Thread(target=self._run, name="LeaderboardClient", daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        """Enfileira (nome, pontuação, dificuldade, data, replay, id de envio) para o servidor."""
+        with self._cond:
+            if len(self._outbox) == self._outbox.maxlen:
+                self.dropped += 1
+            self._outbox.append(row)
+            self._merge_top([row])
+            self._cond.notify()
+
+    def top_scores(self):
+        """Último top recebido do servidor, com as pontuações ainda não confirmadas; None antes da primeira resposta."""
+        return self._top
+
+    def pending(self):
+        return len(self._outbox)
+
+    def flush(self, timeout=None):
+        """Espera a fila de saída esvaziar; retorna False se o prazo acabar antes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._outbox:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=LEADERBOARD_TIMEOUT):
+        """Tenta enviar o que estiver na fila por até `timeout` segundos e encerra a thread."""
+        if self.connected:
+            self.flush(timeout)
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._disconnect()
+        if self._outbox:
+            self.logger.log_error(f"Ranking compartilhado: {len(self._outbox)} pontuação(ões) não enviada(s) "
+                                  f"(continuam no banco local).")
+
+    def _merge_top(self, rows):
+        """Coloca no top em memória as pontuações que se qualificam (chamado com o lock)."""
+        if self._top is None:
+            return
+        top = self._top + [row[:4] for row in rows]
+        top.sort(key=lambda entry: (-entry[1], entry[3]))
+        self._top = top[:LEADERBOARD_SIZE]
+
+    def _connect(self):
+        if self.family == 'unix':
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.target)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._reader = sock.makefile('rb')
+        self.connected = True
+
+    def _disconnect(self):
+        self.connected = False
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _request(self, message):
+        self._sock.sendall(encode_message(message))
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("servidor fechou a conexão")
+        reply = json.loads(line)
+        if not reply.get('ok'):
+            raise LeaderboardError(reply.get('error', 'erro desconhecido'))
+        return reply
+
+    def _run(self):
+        retry_delay = 0.5
+        next_refresh = 0.0
+        while True:
+            with self._cond:
+                if self._closing:
+                    return
+                if self.connected and not self._outbox:
+                    self._cond.wait(max(0.0, next_refresh - time.monotonic()))
+                    if self._closing:
+                        return
+                batch = list(itertools.islice(self._outbox, LEADERBOARD_SUBMIT_BATCH))
+
+            try:
+                if not self.connected:
+                    self._connect()
+                    self.logger.log_info(f"Conectado ao ranking compartilhado em {self.address}.")
+                    retry_delay = 0.5
+                if batch:
+                    self._request({'op': 'submit', 'scores': [encode_score(row) for row in batch]})
+                    with self._cond:
+                        # Com a fila cheia, as mais antigas podem ter sido descartadas enquanto o lote era enviado.
+                        for row in batch:
+                            if self._outbox and self._outbox[0] is row:
+                                self._outbox.popleft()
+                        self.submitted += len(batch)
+                        self._cond.notify_all()
+                if time.monotonic() >= next_refresh:
+                    reply = self._request({'op': 'top', 'limit': LEADERBOARD_SIZE})
+                    with self._cond:
+                        self._top = [tuple(entry) for entry in reply['scores']]
+                        self._merge_top(self._outbox)
+                    next_refresh = time.monotonic() + LEADERBOARD_RECHECK_INTERVAL
+            except (OSError, ValueError, LeaderboardError) as e:
+                if self.connected:
+                    self.logger.log_error(f"Ranking compartilhado indisponível ({e}); tentando de novo.")
+                self._disconnect()
+                with self._cond:
+                    if not self._closing:
+                        self._cond.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, LEADERBOARD_RETRY_MAX)
@@ -0,0 +1,269 @@
+"""Servidor local do ranking compartilhado entre gabinetes (asyncio, TCP ou socket Unix).
+
+    python leaderboard_server.py --listen tcp://0.0.0.0:8765 --db central.db
+    python leaderboard_server.py --listen unix:/tmp/ranking.sock
+
+Os jogos se conectam com GAME_LEADERBOARD=tcp://servidor:8765 (ou LEADERBOARD_SERVER em
+settings.py). O protocolo está descrito em leaderboard_client.py.
+"""
+import argparse
+import asyncio
+import bisect
+import collections
+import concurrent.futures
+import json
+import os
+import signal
+import sqlite3
+import sys
+import time
+
+from logger import GameLogger
+from settings import LEADERBOARD_SIZE, LEADERBOARD_SERVER_DEPTH, LEADERBOARD_SERVER_BATCH
+from database import DatabaseManager, split_difficulty
+from leaderboard_client import parse_address, encode_message, decode_score
+
+# Linhas do protocolo maiores que isto (lotes com replays longos) ainda cabem; acima, a conexão é encerrada.
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+# Conexões aguardando accept; o padrão do asyncio (100) recusa rajadas de reconexão de muitos gabinetes.
+LISTEN_BACKLOG = 1024
+
+
+class LeaderboardServer:
+    """Dono da única conexão SQLite do ranking compartilhado.
+
+    Os envios de todas as conexões entram numa fila; uma única tarefa de escrita grava tudo o
+    que chegou enquanto a transação anterior rodava numa só transação (no máximo `batch_size`
+    pontuações), numa thread própria para não parar o loop. Cada cliente recebe a resposta só
+    depois do commit do seu lote.
+
+    O top de cada modo (mecânica, velocidade) e o geral ficam em listas ordenadas em memória,
+    com as `depth` melhores pontuações: os pedidos de top até esse tamanho não tocam no banco.
+    """
+
+    def __init__(self, db_file, depth=LEADERBOARD_SERVER_DEPTH, batch_size=LEADERBOARD_SERVER_BATCH):
+        self.db = DatabaseManager(db_file)
+        if self.db._conn is None:
+            raise RuntimeError(f"Não foi possível abrir {db_file}")
+        self.depth = depth
+        self.batch_size = batch_size
+        self.logger = GameLogger()
+        # Todo acesso ao SQLite passa por esta thread.
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="LeaderboardDB")
+
+        self._tops = {}
+        self._replies = {}
+        self._sequence = 0
+        self._pending = collections.deque()
+        self._wakeup = None
+        self._writer = None
+        self._server = None
+
+        self.connections = 0
+        self.submissions = 0
+        self.transactions = 0
+        self.rows_written = 0
+        self.rows_inserted = 0
+        self.top_queries = 0
+        self.top_queries_db = 0
+
+        start = time.perf_counter()
+        for name, score, difficulty, timestamp, mechanic, speed in self.db.get_top_by_mode(depth):
+            self._remember(name, score, difficulty, timestamp, (mechanic, speed))
+        self.logger.log_info(f"Ranking compartilhado: top de {sum(key is not None for key in self._tops)} modo(s) "
+                             f"carregado em {time.perf_counter() - start:.2f}s.")
+
+    def _remember(self, name, score, difficulty, timestamp, mode):
+        """Insere a pontuação no top do modo e no geral; entradas ordenadas por (-pontuação, data, ordem de gravação)."""
+        self._sequence += 1
+        entry = (-score, timestamp, self._sequence, name, score, difficulty)
+        for key in (mode, None):
+            top = self._tops.setdefault(key, [])
+            if len(top) >= self.depth and entry >= top[-1]:
+                continue
+            bisect.insort(top, entry)
+            if len(top) > self.depth:
+                top.pop()
+            self._replies.pop(key, None)
+
+    async def start(self, address):
+        family, target = parse_address(address)
+        self._wakeup = asyncio.Event()
+        self._writer = asyncio.create_task(self._write_loop())
+        if family == 'unix':
+            if os.path.exists(target):
+                os.remove(target)
+            self._server = await asyncio.start_unix_server(self._handle, target, limit=MAX_MESSAGE_SIZE,
+                                                           backlog=LISTEN_BACKLOG)
+        else:
+            self._server = await asyncio.start_server(self._handle, *target, limit=MAX_MESSAGE_SIZE,
+                                                      backlog=LISTEN_BACKLOG)
+        self.logger.log_info(f"Ranking compartilhado ouvindo em {address}.")
+        return self._server
+
+    def sockname(self):
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._writer is not None:
+            # A tarefa de escrita termina o que estiver na fila antes de sair.
+            self._pending.append(None)
+            self._wakeup.set()
+            await self._writer
+        self._executor.shutdown()
+        self.db.close()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    op = request['op']
+                    if op == 'submit':
+                        inserted = await self.submit([decode_score(item) for item in request['scores']])
+                        reply = encode_message({'ok': True, 'inserted': inserted})
+                    elif op == 'top':
+                        reply = await self.top_reply(request.get('limit', LEADERBOARD_SIZE),
+                                                     request.get('mechanic'), request.get('speed'))
+                    else:
+                        raise ValueError(f"operação desconhecida: {op!r}")
+                except (ValueError, KeyError, TypeError) as e:
+                    reply = encode_message({'ok': False, 'error': f"pedido inválido: {e}"})
+                except sqlite3.Error as e:
+                    reply = encode_message({'ok': False, 'error': f"falha no banco: {e}"})
+                except Exception as e:
+                    reply = encode_message({'ok': False, 'error': f"falha no servidor: {e!r}"})
+                writer.write(reply)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def submit(self, rows):
+        """Entrega as pontuações à tarefa de escrita e espera o commit; retorna quantas eram novas."""
+        self.submissions += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((rows, future))
+        self._wakeup.set()
+        return await future
+
+    async def _write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                batch = []
+                count = 0
+                while self._pending and count < self.batch_size:
+                    item = self._pending.popleft()
+                    if item is None:
+                        if batch:
+                            await self._write_batch(loop, batch)
+                        return
+                    batch.append(item)
+                    count += len(item[0])
+                await self._write_batch(loop, batch)
+
+    async def _write_batch(self, loop, batch):
+        """Grava o lote e responde aos envios; qualquer falha vai para os envios do lote, e a tarefa de escrita segue."""
+        rows = [row for submitted, _ in batch for row in submitted]
+        try:
+            inserted = await loop.run_in_executor(self._executor, self.db.insert_new_scores, rows)
+
+            self.transactions += 1
+            self.rows_written += len(rows)
+            position = 0
+            for submitted, future in batch:
+                new = 0
+                for name, score, difficulty, timestamp, _, _ in submitted:
+                    if inserted[position]:
+                        new += 1
+                        self._remember(name, score, difficulty, timestamp, split_difficulty(difficulty))
+                    position += 1
+                self.rows_inserted += new
+                # O envio pode ter sido cancelado (cliente desconectou) enquanto o lote era gravado.
+                if not future.done():
+                    future.set_result(new)
+        except Exception as e:
+            self.logger.log_error(f"Falha ao gravar {len(rows)} pontuação(ões) do ranking compartilhado: {e!r}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def top_reply(self, limit, mechanic=None, speed=None):
+        """Resposta já codificada do pedido de top; vem da memória se `limit` couber no que está guardado."""
+        self.top_queries += 1
+        limit = int(limit)
+        if (mechanic is None) == (speed is None) and limit <= self.depth:
+            key = None if mechanic is None else (mechanic, speed)
+            cached = self._replies.get(key)
+            if cached is not None and limit in cached:
+                return cached[limit]
+            top = self._tops.get(key, [])
+            reply = encode_message({'ok': True, 'scores': [[entry[3], entry[4], entry[5], entry[1]]
+                                                           for entry in top[:limit]]})
+            self._replies.setdefault(key, {})[limit] = reply
+            return reply
+
+        # Fora do que está em memória (top mais fundo ou filtro só por mecânica ou velocidade): consulta o banco.
+        self.top_queries_db += 1
+        rows, _ = await asyncio.get_running_loop().run_in_executor(
+            self._executor, lambda: self.db.get_scores_page(mechanic, speed, limit=limit))
+        return encode_message({'ok': True, 'scores': [list(row) for row in rows]})
+
+    def stats(self):
+        return {
+            'connections': self.connections,
+            'submissions': self.submissions,
+            'transactions': self.transactions,
+            'rows_per_transaction': self.rows_written / self.transactions if self.transactions else 0.0,
+            'rows_inserted': self.rows_inserted,
+            'top_queries': self.top_queries,
+            'top_queries_db': self.top_queries_db,
+        }
+
+
+async def serve(address, db_file):
+    server = LeaderboardServer(db_file)
+    await server.start(address)
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            # Windows: só o Ctrl+C, via KeyboardInterrupt.
+            pass
+    print(f"Ranking compartilhado em {address} ({db_file}). Ctrl+C encerra.", file=sys.stderr)
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        print(f"Encerrado: {server.stats()}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--listen', default='tcp://127.0.0.1:8765', help="tcp://host:porta ou unix:/caminho")
+    parser.add_argument('--db', default='ranking.db')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.listen, args.db))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,74 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+from settings import LOG_FILE, LOG_LEVEL, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """Apenas enfileira o registro; a formatação e a escrita ficam na thread do listener."""
+
+    def prepare(self, record):
+        return record
+
 
 class GameLogger:
-    def __init__(self, log_file='error.log'):
+    """Log do processo: todas as instâncias escrevem no mesmo arquivo, por um único listener.
+
+    O arquivo é o da primeira instância; pedir outro antes de GameLogger.shutdown() é erro.
+    """
+    _listener = None
+    _handler = None
+    _log_file = None
+
+    def __init__(self, log_file=LOG_FILE, level=None):
         self.logger = logging.getLogger('GameLogger')
-        self.logger.setLevel(logging.INFO)
-        
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
         
-        file_handler = logging.FileHandler(log_file, mode='a')
-        file_handler.setFormatter(formatter)
+        # GAME_LOG_LEVEL=WARNING desliga os logs de pontuação/partida em produção.
+        if level is None:
+            level = os.environ.get('GAME_LOG_LEVEL', LOG_LEVEL)
+        self.logger.setLevel(level)
         
-        if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
+        if GameLogger._listener is not None and os.path.abspath(log_file) != GameLogger._log_file:
+            raise ValueError(f"O log já está aberto em {GameLogger._log_file}; "
+                             f"chame GameLogger.shutdown() antes de trocar para {log_file}.")
+
+        if GameLogger._listener is None:
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, mode='a', maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+            file_handler.setFormatter(formatter)
+
+            log_queue = queue.SimpleQueue()
+            GameLogger._handler = _RecordQueueHandler(log_queue)
+            GameLogger._listener = logging.handlers.QueueListener(log_queue, file_handler)
+            GameLogger._listener.start()
+            GameLogger._log_file = os.path.abspath(log_file)
+            atexit.register(GameLogger.shutdown)
+
+        if GameLogger._handler not in self.logger.handlers:
+            self.logger.addHandler(GameLogger._handler)
+
+    @classmethod
+    def shutdown(cls):
+        """Esvazia a fila, fecha o arquivo e encerra a thread do listener."""
+        if cls._listener is None:
+            return
+        logging.getLogger('GameLogger').removeHandler(cls._handler)
+        cls._listener.stop()
+        for handler in cls._listener.handlers:
+            handler.close()
+        cls._listener = None
+        cls._handler = None
+        cls._log_file = None
+
+    def log_debug(self, message, *args):
+        self.logger.debug(message, *args)
             
-    def log_info(self, message):
-        self.logger.info(message)
+    def log_info(self, message, *args):
+        self.logger.info(message, *args)
 
-    def log_error(self, message):
-        self.logger.error(message)
\ No newline at end of file
+    def log_error(self, message, *args):
+        self.logger.error(message, *args)
\ No newline at end of file
@@ -1,35 +1,57 @@
+import time
+STARTUP_TIME = time.perf_counter()
+
 import pygame
 import sys
 import itertools 
 import os 
+import random
 
 from settings import *
 from logger import GameLogger
-from database import DatabaseManager
 from player import Bird
 from pipe import PipeManager
+from cache import surface_cache, text_cache
+from simulation import FixedTimestep, tick_rate
+from renderer import DirtyRectRenderer
+from display import Display
+from background import ParallaxBackground
+from collision import CollisionSystem, build_collision_masks
+from replay import Replay
+from ghosts import GhostRace, select_ghosts, course_seed
+from autopilot import Autopilot, state_from_game
+from profiler import FrameProfiler
+from assets_bundle import open_bundle, build_bundle
 from scenes import MenuScene, RankingScene, UIScene, PhaseSelectScene 
 
 class Game:
     def __init__(self):
         try:
-            pygame.init()
-            
-            pygame.mixer.init() 
+            # O mixer só é iniciado junto com a música, depois do primeiro frame (ver _play_music).
+            pygame.display.init()
             
             if not pygame.font.get_init():
                 pygame.font.init()
                 
             self.SCREEN_WIDTH = SCREEN_WIDTH
             self.SCREEN_HEIGHT = SCREEN_HEIGHT
-            self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+            # As cenas desenham em coordenadas lógicas; a partida vai direto para o quadro de desenho (ver Display).
+            self.display = Display.from_env()
+            self.screen = self.display.scene_surface
             pygame.display.set_caption("BATMAN VOADOR GAME")
             self.clock = pygame.time.Clock()
             
             self.logger = GameLogger()
-            self.db_manager = DatabaseManager()
+            self.logger.log_info(f"Vídeo: quadro de {self.display.render_size[0]}x{self.display.render_size[1]} em janela de {self.display.window.get_width()}x{self.display.window.get_height()} ({self.display.mode}).")
+            self._db_manager = None
+            self._game_over_screen = None
+            self._startup_finished = False
+            self.first_frame_time = None
             
             self.assets = self._load_assets()
+            # O fundo em paralaxe só é composto depois do primeiro frame (ver _finish_startup).
+            self.background = None
+            self.renderer = DirtyRectRenderer(self.display, self.assets['background_sky'], DIRTY_RECT_RENDERING)
 
             default_speed_key = "FÁCIL"
             default_mech_key = "ESTÁTICO"
@@ -40,6 +62,14 @@ class Game:
             self.bird = Bird(self.logger, self, self.assets['bird_sprite']) 
             
             self.pipe_manager = None 
+            self.replay = None
+            self.ghost_race = None
+            self.autopilot = None
+            self._autopilot_masks = None
+            self.idle_time = 0.0
+            self.timestep = FixedTimestep(tick_rate(self.current_speed_setting))
+            self.collisions = CollisionSystem()
+            self.profiler = FrameProfiler.from_env()
             
             self.menu_scene = MenuScene(self)
             self.ranking_scene = RankingScene(self)
@@ -48,9 +78,8 @@ class Game:
             
             self.current_state = STATE_MENU
             self.game_running = True
-            self.logger.log_info("Jogo inicializado.")
-
-            self._play_music()
+            self.init_time = time.perf_counter() - STARTUP_TIME
+            self.logger.log_info(f"Jogo inicializado em {self.init_time * 1000:.0f} ms.")
             
         except Exception as e:
             print(f"Erro na Inicialização: {e}")
@@ -60,6 +89,14 @@ class Game:
     def _load_assets(self):
         assets = {}
         base_path = os.path.dirname(__file__)
+
+        # Pacote pré-processado (gerado na primeira execução ou por python assets_bundle.py): pixels já escalados, num único mmap.
+        self.asset_bundle = open_bundle()
+        if self.asset_bundle:
+            for name in ('bird_sprite', 'pipe_sprite', 'background_sky'):
+                assets[name] = self.asset_bundle.surface(name)
+            self.logger.log_info("Assets carregados do pacote pré-processado.")
+            return assets
         
         try:
             bird_path = os.path.join(base_path, 'assets', 'bird.png')
@@ -87,28 +124,61 @@ class Game:
         except pygame.error as e:
             self.logger.log_error(f"Falha ao carregar asset 'ceu.png': {e}")
             assets['background_sky'] = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT)); assets['background_sky'].fill((135, 206, 235))
-
-        try:
-            game_over_path = os.path.join(base_path, 'assets', 'game_over.png')
-            go_img = pygame.image.load(game_over_path).convert_alpha()
-            assets['game_over_screen'] = pygame.transform.scale(go_img, (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
-            self.logger.log_info("Asset 'game_over.png' carregado com sucesso.")
-        except pygame.error as e:
-            self.logger.log_error(f"Falha ao carregar asset 'game_over.png': {e}")
-            assets['game_over_screen'] = None
-
-        try:
-            music_path = os.path.join(base_path, 'assets', 'music.mp3')
-            pygame.mixer.music.load(music_path)
-            self.logger.log_info("Asset 'music.mp3' carregado com sucesso.")
-        except pygame.error as e:
-            self.logger.log_error(f"Falha ao carregar asset 'music.mp3': {e}")
             
         return assets
 
+    @property
+    def db_manager(self):
+        """Banco do ranking, aberto no primeiro uso (fim de partida, ranking ou corrida fantasma).
+
+        GAME_LEADERBOARD=tcp://servidor:8765 liga o ranking compartilhado (ver leaderboard_server.py).
+        """
+        if self._db_manager is None:
+            from database import DatabaseManager
+            self._db_manager = DatabaseManager(remote=os.environ.get('GAME_LEADERBOARD', LEADERBOARD_SERVER))
+        return self._db_manager
+
+    def _get_game_over_screen(self):
+        """Imagem de game over, carregada só no primeiro game over."""
+        if self._game_over_screen is None:
+            if self.asset_bundle:
+                self._game_over_screen = self.asset_bundle.surface('game_over_screen')
+            else:
+                try:
+                    game_over_path = os.path.join(os.path.dirname(__file__), 'assets', 'game_over.png')
+                    go_img = pygame.image.load(game_over_path).convert_alpha()
+                    self._game_over_screen = pygame.transform.scale(go_img, (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+                    self.logger.log_info("Asset 'game_over.png' carregado com sucesso.")
+                except pygame.error as e:
+                    self.logger.log_error(f"Falha ao carregar asset 'game_over.png': {e}")
+                    self._game_over_screen = False
+        return self._game_over_screen
+
+    def _finish_startup(self):
+        """O que não aparece no menu, feito depois do primeiro frame: música, fundo da partida e pacote de assets."""
+        self._startup_finished = True
+        self._play_music()
+        self._compose_background()
+        if self.asset_bundle is None:
+            # Primeira execução (ou PNGs alterados): a próxima inicialização já lê o pacote.
+            try:
+                build_bundle()
+                self.logger.log_info("Pacote de assets gerado em assets/bundle.bin.")
+            except (OSError, pygame.error) as e:
+                self.logger.log_error(f"Falha ao gerar o pacote de assets: {e}")
+
+    def _compose_background(self):
+        if PARALLAX_BACKGROUND and self.background is None:
+            self.background = ParallaxBackground(self.assets['background_sky'], self.display)
+            self.renderer.parallax = self.background
+
     def _play_music(self):
-        """Inicia a reprodução da música de fundo (loop infinito)."""
+        """Inicia o mixer e a música de fundo (loop infinito)."""
         try:
+            pygame.mixer.init()
+            music_path = os.path.join(os.path.dirname(__file__), 'assets', 'music.mp3')
+            pygame.mixer.music.load(music_path)
+            self.logger.log_info("Asset 'music.mp3' carregado com sucesso.")
             pygame.mixer.music.play(-1)
         except pygame.error as e:
             self.logger.log_error(f"Falha ao iniciar a música: {e}")
@@ -136,21 +206,84 @@ class Game:
         if new_state == STATE_QUIT:
             self.game_running = False 
         
-    def start_game(self):
+    def start_game(self, seed=None):
+        self._compose_background()
         pipe_sprite = self.assets['pipe_sprite']
         if self.pipe_manager is None:
              self.pipe_manager = PipeManager(self, pipe_sprite)
              
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.ghost_race = None
+        self.autopilot = None
         self.bird.reset()
-        self.pipe_manager.reset()
+        self.pipe_manager.reset(seed)
+        self.replay = Replay(seed, self.current_speed_setting['speed_name'],
+                             self.current_mechanic_setting['mechanic_name'], self.collisions.pixel_perfect)
+        self.timestep.set_rate(tick_rate(self.current_speed_setting))
         
         self.current_state = STATE_PLAYING
 
+    def start_ghost_race(self):
+        """Partida no percurso fixo do modo atual, contra os fantasmas dos melhores replays feitos nele."""
+        mech_name = self.current_mechanic_setting['mechanic_name']
+        speed_name = self.current_speed_setting['speed_name']
+        seed = course_seed(mech_name, speed_name)
+        replays = select_ghosts(self.db_manager.get_replays(mechanic=mech_name, speed=speed_name), seed, GHOST_COUNT)
+
+        self.start_game(seed)
+        self.ghost_race = GhostRace(replays, self.bird.image)
+        self.current_state = STATE_GHOST_RACE
+        self.logger.log_info(f"Corrida fantasma: {len(replays)} fantasma(s) no percurso {self.replay.seed}.")
+
+    def start_attract(self):
+        """Modo de demonstração: o piloto automático joga no modo selecionado até alguém apertar uma tecla."""
+        masks = None
+        if self.collisions.pixel_perfect:
+            if self._autopilot_masks is None:
+                self._autopilot_masks = build_collision_masks(self.assets['bird_sprite'], self.assets['pipe_sprite'])
+            masks = self._autopilot_masks
+
+        self.start_game()
+        # Demonstração não grava replay nem pontuação.
+        self.replay = None
+        self.autopilot = Autopilot(masks=masks)
+        self.current_state = STATE_ATTRACT
+        self.logger.log_info("Modo demonstração iniciado.")
+
+    def stop_attract(self):
+        stats = self.autopilot.stats()
+        self.logger.log_info(f"Piloto automático: {stats['decisions']} decisões, {stats['decisions_per_second']:,.0f} decisões/s, {stats['nodes_per_decision']:.1f} nós por decisão.")
+        self.autopilot = None
+        self.idle_time = 0.0
+        self.current_state = STATE_MENU
+
     def game_over(self):
+        if self.current_state == STATE_ATTRACT:
+            self.stop_attract()
+            return
+
         self.logger.log_info(f"GAME OVER. Pontuação final: {self.bird.score}. Mecânica: {self.current_mechanic_setting['mechanic_name']}. Velocidade: {self.current_speed_setting['speed_name']}")
         
         combined_difficulty = f"{self.current_mechanic_setting['mechanic_name']} ({self.current_speed_setting['speed_name']})"
-        self.db_manager.save_score("Player Temp", self.bird.score, combined_difficulty)
+        replay_data = None
+        if self.replay and self.pipe_manager:
+            self.replay.finish(self.bird.score, self.pipe_manager.tick)
+            replay_data = self.replay.encode()
+            self.logger.log_debug("Replay gravado: %d flaps em %d bytes.", len(self.replay.flap_ticks), len(replay_data))
+        self.db_manager.save_score("Player Temp", self.bird.score, combined_difficulty, replay_data)
+        self.replay = None
+        self.ghost_race = None
+
+        cache_stats = surface_cache.stats()
+        self.logger.log_info(f"Cache de superfícies: {cache_stats['hits']} acertos, {cache_stats['misses']} faltas, {cache_stats['bytes_reused'] // 1024} KB reaproveitados.")
+
+        text_stats = text_cache.stats()
+        self.logger.log_info(f"Cache de textos: {text_stats['hits']} acertos, {text_stats['misses']} renders, {text_stats['evictions']} descartes.")
+
+        if self.pipe_manager:
+            pool_stats = self.pipe_manager.pool_stats()
+            self.logger.log_info(f"Pool de canos: pico de {pool_stats['high_water_mark']} ativos (capacidade {pool_stats['capacity']}, {pool_stats['allocations']} alocações).")
         
         self.current_state = STATE_GAME_OVER
         pygame.time.set_timer(pygame.USEREVENT + 1, 3000) 
@@ -160,26 +293,37 @@ class Game:
             if event.type == pygame.QUIT:
                 self.change_state(STATE_QUIT)
             
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle_overlay()
+
             if event.type == pygame.USEREVENT + 1:
                 pygame.time.set_timer(pygame.USEREVENT + 1, 0)
                 if self.current_state == STATE_GAME_OVER:
                     self.current_state = STATE_MENU
 
             if self.current_state == STATE_MENU:
+                if event.type == pygame.KEYDOWN:
+                    self.idle_time = 0.0
                 self.menu_scene.handle_input(event)
             elif self.current_state == STATE_SELECT_PHASE:
                 self.phase_select_scene.handle_input(event)
             elif self.current_state == STATE_RANKING:
                 self.ranking_scene.handle_input(event)
-            elif self.current_state == STATE_PLAYING:
+            elif self.current_state == STATE_ATTRACT:
+                if event.type == pygame.KEYDOWN:
+                    self.stop_attract()
+            elif self.current_state in PLAYING_STATES:
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
                     self.bird.flap()
+                    if self.replay and self.pipe_manager:
+                        # O flap vale para o próximo tick: grava quantos ticks já foram simulados.
+                        self.replay.record_flap(self.pipe_manager.tick)
 
     def check_collisions(self):
         if self.pipe_manager is None:
             return 
             
-        if pygame.sprite.spritecollideany(self.bird, self.pipe_manager.pipes):
+        if self.collisions.first_hit(self.bird, self.pipe_manager.pipes):
             self.game_over()
             return
             
@@ -187,53 +331,122 @@ class Game:
             if self.bird.rect.top <= 0 or self.bird.rect.bottom >= self.SCREEN_HEIGHT:
                 self.game_over()
 
+    def step_simulation(self):
+        """Um tick fixo de simulação: física do pássaro, canos e colisões."""
+        profiler = self.profiler
+        if self.autopilot:
+            # Mesmo momento de um flap pelo teclado: antes do tick.
+            if self.autopilot.decide(state_from_game(self)):
+                self.bird.flap()
+            profiler.mark('autopilot')
+        self.bird.update()
+        profiler.mark('bird')
+        self.pipe_manager.update()
+        profiler.mark('pipes')
+        self.check_collisions()
+        profiler.mark('collisions')
+
+    def draw_playing_frame(self, alpha):
+        """Monta e apresenta um frame da partida, interpolado entre o tick anterior e o atual."""
+        profiler = self.profiler
+        scrolled = None
+        if self.background:
+            scrolled = self.background.update(self.pipe_manager.scroll_distance(alpha))
+        self.renderer.begin_frame(scrolled)
+        profiler.mark('background')
+        for pipe in self.pipe_manager.pipes:
+            self.renderer.draw(pipe.image, pipe.interpolated_pos(alpha), LAYER_PIPES)
+
+        if self.ghost_race:
+            tick = self.pipe_manager.tick
+            self.ghost_race.advance(tick)
+            self.renderer.draw_many(self.ghost_race.blit_items(tick, alpha), LAYER_GHOSTS)
+
+        self.renderer.draw(self.bird.image, self.bird.interpolated_pos(alpha), LAYER_SPRITES)
+        profiler.mark('render')
+        self.renderer.draw_many(self.ui_scene.blit_items(self.bird), LAYER_HUD)
+        if profiler.overlay:
+            self.renderer.draw_many(self.ui_scene.overlay_items(profiler.overlay_lines()), LAYER_HUD)
+        profiler.mark('hud')
+        self.renderer.flush()
+        profiler.mark('blits')
+        self.renderer.present()
+        profiler.mark('present')
+
+    def draw_game_over(self):
+        self.screen.fill(BLACK)
+        game_over_screen = self._get_game_over_screen()
+        if game_over_screen:
+            self.screen.blit(game_over_screen, (0, 0))
+        else:
+            self.menu_scene.draw_text("GAME OVER", self.menu_scene.big_font, RED, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, center=True)
+
     def run(self):
+        drawn_state = None
+        profiler = self.profiler
         while self.game_running:
             try:
                 if self.current_state == STATE_QUIT:
                     break 
 
+                profiler.begin_frame()
                 self.handle_input()
-                self.screen.fill(BLACK)
+                profiler.mark('input')
                 
-                fps_limit = FPS * self.current_speed_setting['fps_mult']
-                self.clock.tick(fps_limit)
+                frame_time = self.clock.tick(FPS) / 1000.0
+                profiler.mark('idle')
+
+                if self.current_state != drawn_state:
+                    self.renderer.invalidate()
+                    drawn_state = self.current_state
 
                 if self.current_state == STATE_MENU:
-                    self.menu_scene.draw()
+                    self.idle_time += frame_time
+                    if self.idle_time >= ATTRACT_IDLE_SECONDS:
+                        self.start_attract()
+                    else:
+                        self.renderer.draw_static(self.menu_scene.render_key(), self.menu_scene.draw)
                 elif self.current_state == STATE_SELECT_PHASE:
-                    self.phase_select_scene.draw()
+                    self.renderer.draw_static(self.phase_select_scene.render_key(), self.phase_select_scene.draw)
                 elif self.current_state == STATE_RANKING:
-                    self.ranking_scene.draw()
-                    
-                elif self.current_state == STATE_PLAYING:
+                    self.renderer.draw_static(self.ranking_scene.render_key(), self.ranking_scene.draw)
+                elif self.current_state in PLAYING_STATES:
                     if self.pipe_manager:
-                        self.screen.blit(self.assets['background_sky'], (0, 0)) 
-                        
-                        self.bird.update()
-                        self.pipe_manager.update()
-                        self.check_collisions()
-
-                        for pipe in self.pipe_manager.pipes:
-                            self.screen.blit(pipe.image, pipe.rect)
-                            
-                        self.screen.blit(self.bird.image, self.bird.rect)
-                        self.ui_scene.draw(self.bird)
+                        playing_state = self.current_state
+                        for _ in range(self.timestep.advance(frame_time)):
+                            self.step_simulation()
+                            if self.current_state != playing_state:
+                                break
+
+                        self.draw_playing_frame(self.timestep.alpha)
                     else:
                         self.start_game()
                         
                 elif self.current_state == STATE_GAME_OVER:
-                    if self.assets['game_over_screen']:
-                        self.screen.blit(self.assets['game_over_screen'], (0, 0))
-                    else:
-                        self.menu_scene.draw_text("GAME OVER", self.menu_scene.big_font, RED, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, center=True)
-                
-                pygame.display.flip()
+                    self.renderer.draw_static(STATE_GAME_OVER, self.draw_game_over)
+
+                if self.current_state not in PLAYING_STATES:
+                    profiler.mark('scene')
+                profiler.end_frame(frame_time)
+
+                if self.first_frame_time is None:
+                    self.first_frame_time = time.perf_counter() - STARTUP_TIME
+                    self.logger.log_info(f"Primeiro frame em {self.first_frame_time * 1000:.0f} ms desde o início do processo.")
+                if not self._startup_finished:
+                    self._finish_startup()
 
             except Exception as e:
                 self.logger.log_error(f"Exceção fatal no loop: {e}")
                 self.game_over() 
 
+        profile_path = self.profiler.dump()
+        if profile_path:
+            self.logger.log_info(f"Perfil de frames gravado em {profile_path}.")
+        if self._db_manager:
+            self._db_manager.close()
+        if self.asset_bundle:
+            self.asset_bundle.close()
+        GameLogger.shutdown()
         pygame.quit()
         sys.exit()
 
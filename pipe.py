@@ -1,40 +1,64 @@
 import pygame
-import random
 from settings import *
+from cache import surface_cache
+from course import Course
+from simulation import tick_rate, spawn_interval_ticks, pipe_y_offset
 import math
 
 class Pipe(pygame.sprite.Sprite):
     def __init__(self, x, y, height, position, pipe_sprite, v_speed_mult):
         super().__init__()
+        self.pipe_sprite = pipe_sprite
+        self.amplitude = PIPE_AMPLITUDE
+        self.rect = None
+        self.rearm(x, y, height, position, v_speed_mult)
+
+    def rearm(self, x, y, height, position, v_speed_mult):
+        """Reposiciona um cano (novo ou reciclado do pool) sem alocar uma nova superfície."""
         self.passed = False 
         
         h = max(SCREEN_HEIGHT * 1.5, height)
         self.position = position
         
-        self.image = pygame.transform.scale(pipe_sprite, (PIPE_WIDTH, h))
+        self.image = surface_cache.get_pipe_surface(self.pipe_sprite, (PIPE_WIDTH, int(h)), position)
+        self.mask = surface_cache.get_mask(self.image)
         
+        if self.rect is None:
+            self.rect = self.image.get_rect()
+        else:
+            self.rect.size = self.image.get_size()
+
         if position == 'top':
-            self.image = pygame.transform.flip(self.image, False, True) 
-            self.rect = self.image.get_rect(bottomleft=(x, y))
+            self.rect.bottomleft = (x, y)
         else:
-            self.rect = self.image.get_rect(topleft=(x, y))
+            self.rect.topleft = (x, y)
             
         self.initial_y = self.rect.y
         self.v_speed_mult = v_speed_mult
-        self.amplitude = 50 
         
-        hitbox_reduction = 10 
+        hitbox_reduction = PIPE_HITBOX_REDUCTION
         self.rect.left += hitbox_reduction
         self.rect.width -= hitbox_reduction * 2 
+
+        # Posição horizontal em ponto flutuante: velocidades fracionárias (ex.: 4.5) não dependem do arredondamento do Rect.
+        self.x = float(self.rect.x)
+        self.prev_x = self.rect.x
+        self.prev_y = self.rect.y
             
-    def update(self, pipe_speed):
-        self.rect.x -= pipe_speed
+    def update(self, pipe_speed, sim_time):
+        self.prev_x = self.rect.x
+        self.prev_y = self.rect.y
+
+        self.x -= pipe_speed
+        self.rect.x = int(self.x)
         
         if self.v_speed_mult > 0:
-            time_factor = pygame.time.get_ticks() / 1000.0
-            y_offset = self.amplitude * math.sin(time_factor * self.v_speed_mult * PIPE_V_SPEED)
-            
-            self.rect.y = self.initial_y + int(y_offset)
+            self.rect.y = self.initial_y + pipe_y_offset(sim_time, self.v_speed_mult, self.amplitude)
+
+    def interpolated_pos(self, alpha):
+        """Posição de desenho entre o tick anterior e o atual."""
+        return (self.prev_x + (self.rect.x - self.prev_x) * alpha,
+                self.prev_y + (self.rect.y - self.prev_y) * alpha)
 
 
 class PipeManager:
@@ -42,43 +66,94 @@ class PipeManager:
         self.game = game
         self.pipe_sprite = pipe_sprite
         self.pipes = pygame.sprite.Group()
-        self.last_pipe_time = pygame.time.get_ticks()
+        self.pool = []
+        self.high_water_mark = 0
+        self.allocations = 0
+        self.tick = 0
+        self.course = None
+
+    def pool_capacity(self):
+        """Quantidade máxima de canos simultâneos na tela para a velocidade atual."""
+        speed_setting = self.game.current_speed_setting
+        ticks_per_spawn = spawn_interval_ticks(tick_rate(speed_setting))
+        ticks_on_screen = (SCREEN_WIDTH + PIPE_WIDTH) / speed_setting['pipe_speed']
+        pairs = math.ceil(ticks_on_screen / ticks_per_spawn) + 1
+        return pairs * 2
+
+    def _prewarm(self):
+        """Aloca canos até a capacidade calculada, antes do início da partida."""
+        missing = self.pool_capacity() - len(self.pool) - len(self.pipes)
+        for _ in range(missing):
+            self.pool.append(Pipe(SCREEN_WIDTH, 0, 0, 'bottom', self.pipe_sprite, 0.0))
+            self.allocations += 1
+
+    def _acquire(self, x, y, height, position, v_speed_mult):
+        if self.pool:
+            pipe = self.pool.pop()
+            pipe.rearm(x, y, height, position, v_speed_mult)
+        else:
+            pipe = Pipe(x, y, height, position, self.pipe_sprite, v_speed_mult)
+            self.allocations += 1
+        return pipe
+
+    def _release(self, pipe):
+        self.pipes.remove(pipe)
+        self.pool.append(pipe)
         
     def spawn_pipe(self):
         v_speed_mult = self.game.current_mechanic_setting['v_speed_mult']
         
-        max_height = SCREEN_HEIGHT 
-        gap_center_y = random.randint(int(max_height * 0.2), int(max_height * 0.8))
+        gap_center_y = self.course.next_segment().gap_center
         
         top_y_align = gap_center_y - GAP_SIZE // 2 
         top_height = top_y_align
-        pipe_top = Pipe(SCREEN_WIDTH, top_y_align, top_height, 'top', self.pipe_sprite, v_speed_mult) 
+        pipe_top = self._acquire(SCREEN_WIDTH, top_y_align, top_height, 'top', v_speed_mult) 
         
         bottom_y_align = gap_center_y + GAP_SIZE // 2 
         bottom_height = SCREEN_HEIGHT - bottom_y_align
-        pipe_bottom = Pipe(SCREEN_WIDTH, bottom_y_align, bottom_height, 'bottom', self.pipe_sprite, v_speed_mult) 
+        pipe_bottom = self._acquire(SCREEN_WIDTH, bottom_y_align, bottom_height, 'bottom', v_speed_mult) 
         
         self.pipes.add(pipe_top, pipe_bottom)
+        self.high_water_mark = max(self.high_water_mark, len(self.pipes))
 
     def update(self):
-        current_time = pygame.time.get_ticks()
+        """Avança um tick de simulação: spawn, movimento e pontuação."""
+        self.tick += 1
         
-        pipe_speed = self.game.current_speed_setting['pipe_speed']
+        speed_setting = self.game.current_speed_setting
+        rate = tick_rate(speed_setting)
         
-        if current_time - self.last_pipe_time > PIPE_SPAWN_TIME:
+        if self.tick >= self.course.peek().spawn_tick:
             self.spawn_pipe()
-            self.last_pipe_time = current_time
             
-        self.pipes.update(pipe_speed)
+        self.pipes.update(speed_setting['pipe_speed'], self.tick / rate)
         
-        for pipe in list(self.pipes):
+        for pipe in self.pipes.sprites():
             if pipe.rect.right < 0:
-                pipe.kill()
+                self._release(pipe)
+                continue
             
             if not pipe.passed and pipe.rect.centerx < self.game.bird.rect.left:
                 self.game.bird.point()
                 pipe.passed = True
+
+    def scroll_distance(self, alpha):
+        """Pixels percorridos pelos canos até o instante interpolado do frame: o relógio do fundo em paralaxe."""
+        return (self.tick - 1 + alpha) * self.game.current_speed_setting['pipe_speed']
+
+    def pool_stats(self):
+        return {
+            'active': len(self.pipes),
+            'free': len(self.pool),
+            'capacity': self.pool_capacity(),
+            'high_water_mark': self.high_water_mark,
+            'allocations': self.allocations,
+        }
                 
-    def reset(self):
+    def reset(self, seed=None):
+        """Prepara uma nova partida. Com a mesma semente, o percurso é o mesmo de HeadlessSimulation."""
+        self.course = Course(seed, spawn_interval_ticks(tick_rate(self.game.current_speed_setting)))
+        self.pool.extend(self.pipes)
         self.pipes.empty()
-        self.last_pipe_time = pygame.time.get_ticks()
\ No newline at end of file
+        self._prewarm()
+        self.tick = 0
@@ -1,8 +1,10 @@
 import pygame
 from settings import *
+from simulation import next_vertical_speed
+from cache import surface_cache
 
 class Bird(pygame.sprite.Sprite):
-    def __init__(self, logger, game, bird_sprite, start_pos=(100, SCREEN_HEIGHT // 3)):
+    def __init__(self, logger, game, bird_sprite, start_pos=BIRD_START_POS):
         super().__init__()
         self.logger = logger
         self.game = game 
@@ -13,8 +15,8 @@ class Bird(pygame.sprite.Sprite):
         self.is_started = False 
         
         try:
-            self.image = pygame.transform.scale(bird_sprite, (PLAYER_SIZE, PLAYER_SIZE))
-            hitbox_reduction = 10
+            self.image = surface_cache.get_scaled(bird_sprite, (PLAYER_SIZE, PLAYER_SIZE))
+            hitbox_reduction = BIRD_HITBOX_REDUCTION
             
             self.rect = self.image.get_rect(topleft=start_pos)
             self.rect.width -= hitbox_reduction * 2
@@ -27,13 +29,12 @@ class Bird(pygame.sprite.Sprite):
             self.image.fill(RED)
             self.rect = self.image.get_rect(topleft=start_pos)
 
+        self.mask = surface_cache.get_mask(self.image)
+        self.prev_y = self.rect.y
+
     def apply_gravity(self):
         if self.is_started:
-            self.vertical_speed += GRAVITY
-            
-            if self.vertical_speed > MAX_FALL_SPEED:
-                self.vertical_speed = MAX_FALL_SPEED
-                
+            self.vertical_speed = next_vertical_speed(self.vertical_speed)
             self.rect.y += int(self.vertical_speed)
 
     def flap(self):
@@ -41,10 +42,16 @@ class Bird(pygame.sprite.Sprite):
         self.is_started = True 
 
     def update(self):
+        self.prev_y = self.rect.y
         self.apply_gravity()
+
+    def interpolated_pos(self, alpha):
+        """Posição de desenho entre o tick anterior e o atual."""
+        return (self.rect.x, self.prev_y + (self.rect.y - self.prev_y) * alpha)
         
     def reset(self):
         self.rect.topleft = self.initial_pos
+        self.prev_y = self.rect.y
         self.vertical_speed = 0 
         self.score = 0
         self.is_started = False 
@@ -52,4 +59,4 @@ class Bird(pygame.sprite.Sprite):
 
     def point(self):
         self.score += 1
-        self.logger.log_info(f"Pontuação: {self.score}")
\ No newline at end of file
+        self.logger.log_debug("Pontuação: %d", self.score)
\ No newline at end of file
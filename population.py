@@ -0,0 +1,176 @@
+import numpy as np
+
+from settings import *
+from simulation import HeadlessSimulation, spawn_interval_ticks, pipe_y_offset
+from course import Course
+
+
+class PopulationSimulator:
+    """Simula milhares de pássaros ao mesmo tempo contra o mesmo percurso de canos.
+
+    Posições, velocidades, pontuações e a máscara de vivos ficam em arrays NumPy;
+    a física (GRAVITY/FLAP_STRENGTH/MAX_FALL_SPEED) e as colisões AABB são
+    aplicadas de forma vetorizada. Cada pássaro segue exatamente as mesmas regras
+    de HeadlessSimulation. Com `masks`, a fase estreita é por pixel: as linhas da
+    máscara do cano, já deslocadas para o referencial do pássaro, viram um array
+    uint64 e o teste de todos os pássaros é um único AND vetorizado.
+    """
+
+    BIRD_SIZE = HeadlessSimulation.BIRD_SIZE
+    PIPE_HITBOX_WIDTH = HeadlessSimulation.PIPE_HITBOX_WIDTH
+    PIPE_HEIGHT = HeadlessSimulation.PIPE_HEIGHT
+
+    def __init__(self, n_birds, seed=None, pipe_speed=3, fps_mult=1.0, v_speed_mult=0.0,
+                 gap_size=GAP_SIZE, spawn_time=PIPE_SPAWN_TIME, gravity=GRAVITY,
+                 flap_strength=FLAP_STRENGTH, max_fall_speed=MAX_FALL_SPEED, masks=None):
+        self.n_birds = n_birds
+        self.masks = masks
+        self._shifted_rows = {}
+        if masks is not None:
+            self._bird_rows = np.array(masks.bird.rows, dtype=np.uint64)
+            self._bird_row_offsets = np.arange(masks.bird.height)
+        self.pipe_speed = pipe_speed
+        self.v_speed_mult = v_speed_mult
+        self.gap_size = gap_size
+        self.gravity = gravity
+        self.flap_strength = flap_strength
+        self.max_fall_speed = max_fall_speed
+        self.rate = FPS * fps_mult
+        self.spawn_interval = spawn_interval_ticks(self.rate, spawn_time)
+        self.reset(seed)
+
+    @classmethod
+    def from_settings(cls, n_birds, speed_key="FÁCIL", mechanic_key="ESTÁTICO", seed=None, masks=None):
+        speed = DIFFICULTY_SPEEDS[speed_key]
+        mechanic = PHASE_MECHANICS[mechanic_key]
+        return cls(n_birds, seed=seed, pipe_speed=speed['pipe_speed'], fps_mult=speed['fps_mult'],
+                   v_speed_mult=mechanic['v_speed_mult'], masks=masks)
+
+    def reset(self, seed=None):
+        self.course = Course(seed, self.spawn_interval)
+        self.tick = 0
+        self.bird_x = BIRD_START_POS[0]
+        self.bird_y = np.full(self.n_birds, BIRD_START_POS[1], dtype=np.int64)
+        self.vertical_speed = np.zeros(self.n_birds, dtype=np.float64)
+        self.started = np.zeros(self.n_birds, dtype=bool)
+        self.alive = np.ones(self.n_birds, dtype=bool)
+        self.scores = np.zeros(self.n_birds, dtype=np.int64)
+        self.death_tick = np.full(self.n_birds, -1, dtype=np.int64)
+        # Mesmo formato de HeadlessSimulation: [x (float), x (int), topo do vão, base do vão, passou]
+        self.pipes = []
+
+    def _spawn_pipe(self):
+        # Mesmo percurso de PipeManager e HeadlessSimulation para a mesma semente.
+        gap_center_y = self.course.next_segment().gap_center
+        x = SCREEN_WIDTH + PIPE_HITBOX_REDUCTION
+        self.pipes.append([float(x), x, gap_center_y - self.gap_size // 2,
+                           gap_center_y + self.gap_size // 2, False])
+
+    def _pipe_rows_in_bird_frame(self, pipe_mask, dx):
+        """Linhas do cano deslocadas para o referencial do pássaro (mais uma linha vazia no fim)."""
+        key = (id(pipe_mask), dx)
+        rows = self._shifted_rows.get(key)
+        if rows is None:
+            full = (1 << self.masks.bird.width) - 1
+            if dx >= 0:
+                shifted = [(row << dx) & full for row in pipe_mask.rows]
+            else:
+                shifted = [(row >> -dx) & full for row in pipe_mask.rows]
+            rows = self._shifted_rows[key] = np.array(shifted + [0], dtype=np.uint64)
+        return rows
+
+    def _mask_hits(self, pipe_mask, dx, pipe_y):
+        rows = self._pipe_rows_in_bird_frame(pipe_mask, dx)
+        index = self.bird_y[:, None] + self._bird_row_offsets[None, :] - pipe_y
+        index[(index < 0) | (index >= pipe_mask.height)] = pipe_mask.height
+        return ((rows[index] & self._bird_rows[None, :]) != 0).any(axis=1)
+
+    def step(self, flaps):
+        """Avança um tick para todos os pássaros. flaps: array booleano (n_birds,). Retorna a máscara de vivos."""
+        alive = self.alive
+        flaps = np.asarray(flaps, dtype=bool) & alive
+
+        self.vertical_speed[flaps] = self.flap_strength
+        self.started |= flaps
+
+        moving = self.started & alive
+        vs = np.minimum(self.vertical_speed + self.gravity, self.max_fall_speed)
+        self.vertical_speed = np.where(moving, vs, self.vertical_speed)
+        self.bird_y += np.where(moving, np.trunc(self.vertical_speed), 0).astype(np.int64)
+
+        self.tick += 1
+        if self.tick >= self.course.peek().spawn_tick:
+            self._spawn_pipe()
+
+        offset = 0
+        if self.v_speed_mult > 0:
+            offset = pipe_y_offset(self.tick / self.rate, self.v_speed_mult, PIPE_AMPLITUDE)
+
+        bird_x = self.bird_x
+        y = self.bird_y
+        size = self.BIRD_SIZE
+        width = self.PIPE_HITBOX_WIDTH
+        height = self.PIPE_HEIGHT
+        hit = np.zeros(self.n_birds, dtype=bool)
+
+        for pipe in list(self.pipes):
+            pipe[0] -= self.pipe_speed
+            x = pipe[1] = int(pipe[0])
+
+            if x + width < 0:
+                self.pipes.remove(pipe)
+                continue
+
+            if not pipe[4] and x + width // 2 < bird_x:
+                self.scores += 2 * alive
+                pipe[4] = True
+
+            # Fase ampla: só os canos que cruzam a coluna do pássaro chegam ao teste por pássaro.
+            if self.masks is not None:
+                if bird_x < x + PIPE_WIDTH and bird_x + PLAYER_SIZE > x:
+                    dx = x - bird_x
+                    hit |= self._mask_hits(self.masks.top, dx, pipe[2] + offset - height)
+                    hit |= self._mask_hits(self.masks.bottom, dx, pipe[3] + offset)
+            elif bird_x < x + width and bird_x + size > x:
+                gap_top = pipe[2] + offset
+                gap_bottom = pipe[3] + offset
+                hit |= ((y < gap_top) & (y + size > gap_top - height)) | \
+                       ((y < gap_bottom + height) & (y + size > gap_bottom))
+
+        hit |= self.started & ((y <= 0) | (y + size >= SCREEN_HEIGHT))
+
+        died = hit & alive
+        self.death_tick[died] = self.tick
+        self.alive &= ~hit
+        return self.alive
+
+    def next_gap(self):
+        """Retorna (x, topo, base) do próximo vão à frente dos pássaros, ou None."""
+        offset = 0
+        if self.v_speed_mult > 0:
+            offset = pipe_y_offset(self.tick / self.rate, self.v_speed_mult, PIPE_AMPLITUDE)
+        for pipe in self.pipes:
+            if pipe[1] + self.PIPE_HITBOX_WIDTH >= self.bird_x:
+                return (pipe[1], pipe[2] + offset, pipe[3] + offset)
+        return None
+
+    def run(self, policy, max_ticks=None):
+        """Executa até todos morrerem (ou até max_ticks). policy(sim) -> array booleano de flaps."""
+        while self.alive.any():
+            if max_ticks is not None and self.tick >= max_ticks:
+                break
+            self.step(policy(self))
+        return self.scores
+
+
+def scripted_policy(sim):
+    """Versão vetorizada de simulation.scripted_policy."""
+    gap = sim.next_gap()
+    target = (gap[1] + gap[2]) // 2 if gap else SCREEN_HEIGHT // 2
+    return (sim.bird_y + sim.BIRD_SIZE // 2 > target + 10) & (sim.vertical_speed >= 0)
+
+
+def random_policy(flap_probability=0.06, seed=None):
+    """Política aleatória vetorizada: cada pássaro bate asas com a probabilidade informada."""
+    rng = np.random.default_rng(seed)
+    return lambda sim: rng.random(sim.n_birds) < flap_probability
@@ -0,0 +1,157 @@
+import os
+import time
+from array import array
+
+from settings import FPS, PROFILE_WINDOW, PROFILE_OVERLAY_REFRESH, PROFILE_DEFAULT_FILE
+
+
+class PhaseStats:
+    """Janela circular com as últimas durações (em ms) de uma fase, mais totais da sessão."""
+
+    def __init__(self, window):
+        self.values = array('d', bytes(8 * window))
+        self.window = window
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.values[self.count % self.window] = ms
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentiles(self, *ps):
+        n = min(self.count, self.window)
+        if not n:
+            return [0.0 for _ in ps]
+        ordered = sorted(self.values[:n])
+        return [ordered[min(n - 1, int(p / 100 * n))] for p in ps]
+
+    def summary(self):
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            'frames': self.count,
+            'mean_ms': self.total / self.count if self.count else 0.0,
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'p99_ms': p99,
+            'max_ms': self.max,
+        }
+
+
+class FrameProfiler:
+    """Cronômetros por fase do frame (entrada, física, canos, colisões, desenho, HUD, apresentação).
+
+    Cada mark(fase) soma o tempo decorrido desde a marca anterior à fase; end_frame() fecha o
+    frame. Desligado, mark/begin_frame/end_frame são funções vazias e o custo é só a chamada.
+    GAME_PROFILE=arquivo.json (ou .csv) liga o profiler desde o início e grava o resumo na saída.
+    """
+
+    def __init__(self, enabled=False, dump_path=None, window=PROFILE_WINDOW, target_fps=FPS):
+        self.window = window
+        self.frame_budget_ms = 1000.0 / target_fps
+        self.dump_path = dump_path
+        self.phases = {}
+        self.frames = 0
+        self.dropped_frames = 0
+        self.overlay = False
+        self._frame = {}
+        self._last = 0.0
+        self._overlay_lines = []
+        self.set_enabled(enabled or dump_path is not None)
+
+    @classmethod
+    def from_env(cls):
+        """GAME_PROFILE=1 usa o arquivo padrão; qualquer outro valor é o caminho do resumo."""
+        value = os.environ.get('GAME_PROFILE')
+        if not value or value == '0':
+            return cls()
+        return cls(dump_path=PROFILE_DEFAULT_FILE if value == '1' else value)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            self.begin_frame = self._begin_frame
+            self.mark = self._mark
+            self.end_frame = self._end_frame
+        else:
+            self.begin_frame = self.mark = self.end_frame = self._noop
+
+    def toggle_overlay(self):
+        """Tecla de atalho: mostra/esconde o overlay (e liga a coleta enquanto ele estiver visível)."""
+        self.overlay = not self.overlay
+        self.set_enabled(self.overlay or self.dump_path is not None)
+        self._overlay_lines = []
+
+    def _noop(self, *args):
+        pass
+
+    def _begin_frame(self):
+        self._frame.clear()
+        self._last = time.perf_counter()
+
+    def _mark(self, phase):
+        now = time.perf_counter()
+        frame = self._frame
+        frame[phase] = frame.get(phase, 0.0) + (now - self._last) * 1000.0
+        self._last = now
+
+    def _end_frame(self, frame_time):
+        """frame_time: duração total do frame em segundos, como retornada pelo relógio do jogo."""
+        self._frame['frame'] = frame_time * 1000.0
+        for phase, ms in self._frame.items():
+            stats = self.phases.get(phase)
+            if stats is None:
+                stats = self.phases[phase] = PhaseStats(self.window)
+            stats.add(ms)
+
+        self.frames += 1
+        # Perdeu o frame quem passou de 1,5x o orçamento: a tela ficou um refresh sem imagem nova.
+        if frame_time * 1000.0 > self.frame_budget_ms * 1.5:
+            self.dropped_frames += 1
+
+        if self.overlay and (not self._overlay_lines or self.frames % PROFILE_OVERLAY_REFRESH == 0):
+            self._overlay_lines = self._build_overlay_lines()
+
+    def _build_overlay_lines(self):
+        lines = [f"frames {self.frames} | perdidos {self.dropped_frames} | alvo {self.frame_budget_ms:.1f} ms"]
+        for phase, stats in self.phases.items():
+            p50, p95, p99 = stats.percentiles(50, 95, 99)
+            lines.append(f"{phase:<10} p50 {p50:6.2f}  p95 {p95:6.2f}  p99 {p99:6.2f} ms")
+        return lines
+
+    def overlay_lines(self):
+        return self._overlay_lines
+
+    def summary(self):
+        return {
+            'frames': self.frames,
+            'dropped_frames': self.dropped_frames,
+            'frame_budget_ms': self.frame_budget_ms,
+            'window': self.window,
+            'phases': {phase: stats.summary() for phase, stats in self.phases.items()},
+        }
+
+    def dump(self, path=None):
+        """Grava o resumo em JSON ou, se o arquivo terminar em .csv, uma linha por fase."""
+        path = path or self.dump_path
+        if path is None or not self.frames:
+            return None
+        import csv
+        import json
+
+        summary = self.summary()
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['phase', 'frames', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'dropped_frames'])
+                for phase, stats in summary['phases'].items():
+                    writer.writerow([phase, stats['frames'], f"{stats['mean_ms']:.4f}", f"{stats['p50_ms']:.4f}",
+                                     f"{stats['p95_ms']:.4f}", f"{stats['p99_ms']:.4f}", f"{stats['max_ms']:.4f}",
+                                     summary['dropped_frames']])
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2)
+        return path
@@ -0,0 +1,144 @@
+"""Importação/exportação em streaming e manutenção do banco do ranking.
+
+    python ranking_tool.py export gabinete1.jsonl              # .csv ou .jsonl; '-' = saída padrão (JSON lines)
+    python ranking_tool.py import gabinete1.jsonl gabinete2.csv --db central.db
+    python ranking_tool.py prune --keep 1000                   # por modo, seguido de VACUUM
+
+Os arquivos têm as colunas name, score, difficulty, timestamp, replay (base64, vazio se
+não houver) e submission_id (id de envio da partida, vazio nas linhas antigas). A importação
+ignora pontuações que já existem no banco: mesmo id de envio ou, sem id, mesmos nome,
+pontuação, dificuldade e data.
+"""
+import argparse
+import base64
+import csv
+import json
+import os
+import sys
+import time
+
+from settings import IMPORT_CHUNK_SIZE, RETENTION_DEPTH
+
+COLUMNS = ('name', 'score', 'difficulty', 'timestamp', 'replay', 'submission_id')
+
+
+def _is_csv(path):
+    return path.lower().endswith('.csv')
+
+
+def _encode_replay(replay):
+    return base64.b64encode(replay).decode('ascii') if replay is not None else None
+
+
+def _decode_replay(text):
+    return base64.b64decode(text) if text else None
+
+
+def write_scores(rows, f, csv_format):
+    """Grava linhas (nome, pontuação, dificuldade, data, replay, id de envio) no arquivo aberto; retorna quantas."""
+    count = 0
+    if csv_format:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for name, score, difficulty, timestamp, replay, submission_id in rows:
+            writer.writerow((name, score, difficulty, timestamp, _encode_replay(replay) or '', submission_id or ''))
+            count += 1
+        return count
+
+    dumps = json.dumps
+    write = f.write
+    for name, score, difficulty, timestamp, replay, submission_id in rows:
+        write(dumps({'name': name, 'score': score, 'difficulty': difficulty, 'timestamp': timestamp,
+                     'replay': _encode_replay(replay), 'submission_id': submission_id}, ensure_ascii=False))
+        write('\n')
+        count += 1
+    return count
+
+
+def read_scores(f, csv_format):
+    """Gerador de linhas (nome, pontuação, dificuldade, data, replay, id de envio) a partir do arquivo aberto."""
+    if csv_format:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        index = [header.index(column) for column in COLUMNS[:4]]
+        replay_index = header.index('replay') if 'replay' in header else None
+        id_index = header.index('submission_id') if 'submission_id' in header else None
+        for record in reader:
+            if not record:
+                continue
+            replay = _decode_replay(record[replay_index]) if replay_index is not None else None
+            submission_id = (record[id_index] or None) if id_index is not None else None
+            yield (record[index[0]], int(record[index[1]]), record[index[2]], record[index[3]], replay, submission_id)
+        return
+
+    loads = json.loads
+    for line in f:
+        if not line.strip():
+            continue
+        record = loads(line)
+        yield (record['name'], int(record['score']), record['difficulty'], record['timestamp'],
+               _decode_replay(record.get('replay')), record.get('submission_id') or None)
+
+
+def export_command(db_manager, args):
+    csv_format = _is_csv(args.output)
+    start = time.perf_counter()
+    if args.output == '-':
+        count = write_scores(db_manager.iter_scores(), sys.stdout, False)
+    else:
+        with open(args.output, 'w', newline='' if csv_format else None, encoding='utf-8') as f:
+            count = write_scores(db_manager.iter_scores(), f, csv_format)
+    elapsed = time.perf_counter() - start
+    print(f"{count:,} pontuações exportadas em {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f}/s)", file=sys.stderr)
+
+
+def import_command(db_manager, args):
+    for path in args.inputs:
+        csv_format = _is_csv(path)
+        start = time.perf_counter()
+        with open(path, newline='' if csv_format else None, encoding='utf-8') as f:
+            read, inserted = db_manager.import_scores(read_scores(f, csv_format), args.chunk_size)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {read:,} lidas, {inserted:,} novas, {read - inserted:,} repetidas "
+              f"em {elapsed:.2f}s ({read / max(elapsed, 1e-9):,.0f} linhas/s)")
+
+
+def prune_command(db_manager, args):
+    size = os.path.getsize(db_manager.db_file)
+    removed = db_manager.prune(args.keep)
+    print(f"{removed:,} pontuações removidas; arquivo de {size / 1024 / 1024:.1f} MB "
+          f"para {os.path.getsize(db_manager.db_file) / 1024 / 1024:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='ranking.db')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export', help="Exporta todas as pontuações.")
+    export_parser.add_argument('output')
+    export_parser.set_defaults(run=export_command)
+
+    import_parser = commands.add_parser('import', help="Importa pontuações, ignorando as repetidas.")
+    import_parser.add_argument('inputs', nargs='+')
+    import_parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help="Linhas por transação.")
+    import_parser.set_defaults(run=import_command)
+
+    prune_parser = commands.add_parser('prune', help="Mantém as melhores pontuações de cada modo e compacta o banco.")
+    prune_parser.add_argument('--keep', type=int, default=RETENTION_DEPTH, help="Pontuações mantidas por modo.")
+    prune_parser.set_defaults(run=prune_command)
+
+    args = parser.parse_args()
+
+    from database import DatabaseManager
+    db_manager = DatabaseManager(args.db)
+    try:
+        args.run(db_manager, args)
+    finally:
+        db_manager.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+from collections import OrderedDict
+
+import pygame
+from settings import LAYER_SPRITES, RENDER_SCALE_CACHE_SIZE
+
+
+class RenderQueue:
+    """Acumula pares (superfície, posição) por camada e os envia numa única chamada Surface.blits."""
+
+    def __init__(self):
+        self._layers = {}
+        self._batch = []
+
+    def submit(self, surface, pos, layer=LAYER_SPRITES):
+        items = self._layers.get(layer)
+        if items is None:
+            items = self._layers[layer] = []
+        items.append((surface, pos))
+
+    def submit_many(self, items, layer=LAYER_SPRITES):
+        for surface, pos in items:
+            self.submit(surface, pos, layer)
+
+    def flush(self, target):
+        """Desenha tudo em ordem crescente de camada e retorna as regiões afetadas."""
+        batch = self._batch
+        for layer in sorted(self._layers):
+            items = self._layers[layer]
+            batch.extend(items)
+            items.clear()
+        rects = target.blits(batch) if batch else []
+        batch.clear()
+        return rects
+
+
+class ScaledSprites:
+    """Versões dos sprites na escala do quadro de desenho (LRU: textos do HUD e do overlay mudam)."""
+
+    def __init__(self, scale, max_entries=RENDER_SCALE_CACHE_SIZE):
+        self.scale = scale
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+
+    def get(self, surface):
+        key = id(surface)
+        entry = self._surfaces.get(key)
+        if entry is not None and entry[0] is surface:
+            self._surfaces.move_to_end(key)
+            return entry[1]
+        width, height = surface.get_size()
+        size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+        scaled = pygame.transform.smoothscale(surface, size)
+        # Guarda a referência do original para que o id() não seja reaproveitado.
+        self._surfaces[key] = (surface, scaled)
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return scaled
+
+    def items(self, items):
+        """Converte pares (superfície, posição lógica) em pares no quadro de desenho."""
+        scale = self.scale
+        get = self.get
+        return [(get(surface), (int(pos[0] * scale), int(pos[1] * scale))) for surface, pos in items]
+
+
+class DirtyRectRenderer:
+    """Apresenta na tela apenas as regiões que mudaram desde o frame anterior.
+
+    Cenas estáticas (menu, seleção, ranking, game over) só são redesenhadas quando a
+    chave de renderização delas muda. Na partida, o fundo é restaurado apenas sob os
+    sprites do frame anterior e a tela recebe display.update() com essas regiões (mais a
+    faixa do fundo que rolou, se o fundo for o de paralaxe). Com enabled=False o
+    comportamento é o antigo: tudo redesenhado e display.flip().
+    As posições chegam em coordenadas lógicas; com Display.scale != 1 os sprites são
+    trocados pelas versões reduzidas antes de entrar na fila.
+    """
+
+    def __init__(self, display, background, enabled=True, parallax=None):
+        self.display = display
+        self.screen = display.target
+        self.scaled = None
+        if display.scale != 1:
+            self.scaled = ScaledSprites(display.scale)
+        if background.get_size() != display.render_size:
+            background = pygame.transform.smoothscale(background, display.render_size)
+        self.background = background
+        self.parallax = parallax
+        self.enabled = enabled
+        self._previous = []
+        self._current = []
+        self.queue = RenderQueue()
+        self._static_key = None
+        self._full_redraw = True
+        self._band = None
+
+    def invalidate(self):
+        """Força um redesenho completo no próximo frame (ex.: troca de estado)."""
+        self._full_redraw = True
+        self._static_key = None
+
+    def draw_static(self, key, draw_fn):
+        """Desenha uma cena estática só quando a chave muda; senão o frame não custa nada."""
+        if self.enabled and not self._full_redraw and key == self._static_key:
+            return
+        draw_fn()
+        self.display.present_scene()
+        self._static_key = key
+        self._full_redraw = False
+        self._previous.clear()
+
+    def begin_frame(self, scrolled=None):
+        """Início de um frame dinâmico: restaura o fundo sob o que foi desenhado no frame anterior.
+
+        Com o fundo em paralaxe, scrolled é a faixa que rolou desde o frame anterior (o Rect de
+        ParallaxBackground.update(), ou None): ela é redesenhada inteira e apresentada junto com
+        as regiões dos sprites, que só precisam ser restauradas acima dela.
+        """
+        self._static_key = None
+        self._band = scrolled
+        parallax = self.parallax
+        if not self.enabled or self._full_redraw:
+            if parallax is None:
+                self.screen.blit(self.background, (0, 0))
+            else:
+                self.screen.blits(parallax.items(), False)
+            return
+        if parallax is None:
+            background = self.background
+            self.screen.blits([(background, rect, rect) for rect in self._previous], False)
+            return
+        top = scrolled.top if scrolled is not None else parallax.height
+        items = parallax.restore_items(self._previous, top)
+        if scrolled is not None:
+            items.extend(parallax.items(top))
+        self.screen.blits(items, False)
+
+    def draw(self, surface, pos, layer=LAYER_SPRITES):
+        """Enfileira o sprite; ele só é desenhado no present(), junto com os demais."""
+        if self.scaled:
+            scale = self.scaled.scale
+            surface = self.scaled.get(surface)
+            pos = (int(pos[0] * scale), int(pos[1] * scale))
+        self.queue.submit(surface, pos, layer)
+
+    def draw_many(self, items, layer=LAYER_SPRITES):
+        if self.scaled:
+            items = self.scaled.items(items)
+        self.queue.submit_many(items, layer)
+
+    def flush(self):
+        """Desenha na tela o que está na fila (present() também faz isso, se ainda houver algo)."""
+        self._current.extend(self.queue.flush(self.screen))
+
+    def present(self):
+        self.flush()
+        if not self.enabled or self._full_redraw:
+            self.display.present()
+            self._full_redraw = False
+        else:
+            rects = self._previous + self._current
+            if self._band is not None:
+                rects.append(self._band)
+            self.display.present(rects)
+        self._previous, self._current = self._current, self._previous
+        self._current.clear()
@@ -0,0 +1,220 @@
+"""Replays compactos (semente + ticks de flap) e verificação headless das pontuações gravadas."""
+import os
+import struct
+
+from settings import FPS, FLAP_STRENGTH, BIRD_START_POS, DIFFICULTY_SPEEDS, PHASE_MECHANICS
+from simulation import HeadlessSimulation, next_vertical_speed
+
+REPLAY_MAGIC = b'FBR'
+REPLAY_VERSION = 1
+FLAG_PIXEL_PERFECT = 0x01
+
+
+def _write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _write_text(out, text):
+    encoded = text.encode('utf-8')
+    out.append(len(encoded))
+    out.extend(encoded)
+
+
+def _read_text(data, pos):
+    length = data[pos]
+    pos += 1
+    return data[pos:pos + length].decode('utf-8'), pos + length
+
+
+class Replay:
+    """Semente do percurso + ticks em que houve flap: o suficiente para reproduzir a partida.
+
+    No formato binário os ticks de flap são gravados como diferenças em varint, o que
+    costuma dar 1 byte por flap.
+    """
+
+    def __init__(self, seed, speed_key, mechanic_key, pixel_perfect, flap_ticks=None, score=0, end_tick=0):
+        self.seed = seed
+        self.speed_key = speed_key
+        self.mechanic_key = mechanic_key
+        self.pixel_perfect = pixel_perfect
+        self.flap_ticks = flap_ticks if flap_ticks is not None else []
+        self.score = score
+        self.end_tick = end_tick
+
+    def record_flap(self, tick):
+        """Registra um flap aplicado antes do tick de número `tick` (ticks já simulados)."""
+        if not self.flap_ticks or self.flap_ticks[-1] != tick:
+            self.flap_ticks.append(tick)
+
+    def finish(self, score, end_tick):
+        self.score = score
+        self.end_tick = end_tick
+
+    def encode(self):
+        out = bytearray(REPLAY_MAGIC)
+        out.append(REPLAY_VERSION)
+        out.extend(struct.pack('<I', self.seed & 0xFFFFFFFF))
+        out.append(FLAG_PIXEL_PERFECT if self.pixel_perfect else 0)
+        _write_varint(out, self.score)
+        _write_varint(out, self.end_tick)
+        _write_text(out, self.speed_key)
+        _write_text(out, self.mechanic_key)
+        _write_varint(out, len(self.flap_ticks))
+        previous = 0
+        for tick in self.flap_ticks:
+            _write_varint(out, tick - previous)
+            previous = tick
+        return bytes(out)
+
+    @staticmethod
+    def read_seed(data):
+        """Só a semente do percurso, sem decodificar os flaps."""
+        if data[:3] != REPLAY_MAGIC or data[3] != REPLAY_VERSION:
+            raise ValueError("Replay em formato desconhecido.")
+        return struct.unpack_from('<I', data, 4)[0]
+
+    @classmethod
+    def decode(cls, data):
+        if data[:3] != REPLAY_MAGIC or data[3] != REPLAY_VERSION:
+            raise ValueError("Replay em formato desconhecido.")
+        seed = struct.unpack_from('<I', data, 4)[0]
+        flags = data[8]
+        pos = 9
+        score, pos = _read_varint(data, pos)
+        end_tick, pos = _read_varint(data, pos)
+        speed_key, pos = _read_text(data, pos)
+        mechanic_key, pos = _read_text(data, pos)
+        count, pos = _read_varint(data, pos)
+        flap_ticks = []
+        tick = 0
+        for _ in range(count):
+            delta, pos = _read_varint(data, pos)
+            tick += delta
+            flap_ticks.append(tick)
+        return cls(seed, speed_key, mechanic_key, bool(flags & FLAG_PIXEL_PERFECT), flap_ticks, score, end_tick)
+
+    def simulation(self, masks=None):
+        """HeadlessSimulation configurada com a mesma semente e dificuldade da partida gravada."""
+        if self.speed_key not in DIFFICULTY_SPEEDS or self.mechanic_key not in PHASE_MECHANICS:
+            raise ValueError(f"Dificuldade desconhecida no replay: {self.mechanic_key} ({self.speed_key})")
+        return HeadlessSimulation.from_settings(self.speed_key, self.mechanic_key, self.seed,
+                                                masks=masks if self.pixel_perfect else None)
+
+
+def replay_positions(replay):
+    """Gera (tick, y do pássaro) de cada tick da partida.
+
+    A trajetória do pássaro só depende dos flaps e da física (os canos apenas encerram a
+    partida, no end_tick gravado), então não é preciso simular os canos.
+    """
+    flaps = set(replay.flap_ticks)
+    y = BIRD_START_POS[1]
+    vertical_speed = 0
+    started = False
+    for tick in range(replay.end_tick):
+        if tick in flaps:
+            vertical_speed = FLAP_STRENGTH
+            started = True
+        if started:
+            vertical_speed = next_vertical_speed(vertical_speed)
+            y += int(vertical_speed)
+        yield tick + 1, y
+
+
+def verify_replay(replay, masks=None):
+    """Reexecuta a partida sem janela. Retorna (confere, pontuação simulada, tick final simulado)."""
+    if replay.pixel_perfect and masks is None:
+        raise ValueError("Replay gravado com colisão por pixel: informe as máscaras (collision.load_collision_masks).")
+    sim = replay.simulation(masks)
+    flaps = set(replay.flap_ticks)
+    # Um flap depois do fim da partida, ou uma partida que dura além do tick gravado, já invalida o replay.
+    while not sim.collided and sim.tick < replay.end_tick:
+        sim.step(sim.tick in flaps)
+    valid = (sim.collided and sim.tick == replay.end_tick and sim.score == replay.score
+             and (not replay.flap_ticks or replay.flap_ticks[-1] < replay.end_tick))
+    return valid, sim.score, sim.tick
+
+
+_worker_masks = None
+
+
+def _init_worker(masks):
+    global _worker_masks
+    _worker_masks = masks
+
+
+def verify_entry(entry):
+    """Verifica uma linha (id, nome, pontuação, replay) do ranking. Roda dentro dos processos do pool."""
+    row_id, name, score, data = entry
+    try:
+        replay = Replay.decode(data)
+        valid, sim_score, sim_tick = verify_replay(replay, _worker_masks)
+    except (ValueError, IndexError, struct.error) as e:
+        return row_id, name, score, False, None, str(e)
+    # A pontuação da tabela também precisa bater com a do replay.
+    if valid and score == replay.score:
+        return row_id, name, score, True, sim_score, sim_tick
+    return row_id, name, score, False, sim_score, f"fim simulado no tick {sim_tick}, gravado no tick {replay.end_tick}"
+
+
+def main():
+    # Só a linha de comando precisa destes módulos; o jogo importa replay.py na inicialização.
+    import argparse
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(description="Reexecuta sem janela os replays gravados no ranking e confere as pontuações.")
+    parser.add_argument('--db', default='ranking.db')
+    parser.add_argument('--limit', type=int, default=None, help="Verifica só as N maiores pontuações.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    from collision import load_collision_masks
+    from database import DatabaseManager
+
+    db_manager = DatabaseManager(args.db)
+    entries = db_manager.get_replays(args.limit)
+    db_manager.close()
+
+    start = time.perf_counter()
+    masks = load_collision_masks()
+    invalid = []
+    total_ticks = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(masks,)) as pool:
+        chunksize = max(1, len(entries) // (args.workers * 4))
+        for row_id, name, score, valid, sim_score, detail in pool.map(verify_entry, entries, chunksize=chunksize):
+            if valid:
+                total_ticks += detail
+            else:
+                invalid.append((row_id, name, score, sim_score, detail))
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(entries)} replays verificados em {elapsed:.2f}s com {args.workers} processos "
+          f"({total_ticks:,} ticks, {total_ticks / FPS / max(elapsed, 1e-9):,.0f}x o tempo real)")
+    for row_id, name, score, sim_score, detail in invalid:
+        print(f"INVÁLIDO id={row_id} {name}: gravado {score}, simulado {sim_score} ({detail})")
+    return 1 if invalid else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 import pygame
 from settings import *
+from cache import text_cache
 
 class BaseScene:
     def __init__(self, game):
@@ -15,7 +16,7 @@ class BaseScene:
 
 
     def draw_text(self, text, font, color, x, y, center=False):
-        text_surface = font.render(text, True, color)
+        text_surface = text_cache.render(font, text, color)
         rect = text_surface.get_rect()
         if center:
             rect.center = (x, y)
@@ -23,13 +24,17 @@ class BaseScene:
             rect.topleft = (x, y)
         self.screen.blit(text_surface, rect)
         
+    def render_key(self):
+        """Tudo o que altera a imagem da cena; enquanto não mudar, ela não precisa ser redesenhada."""
+        return None
+
     def draw(self):
         pass
 
 class MenuScene(BaseScene):
     def __init__(self, game):
         super().__init__(game)
-        self.options = ["Iniciar Jogo", "Selecionar Nível", "Ver Ranking", "Sair"] 
+        self.options = ["Iniciar Jogo", "Corrida Fantasma", "Selecionar Nível", "Ver Ranking", "Sair"] 
         self.selected_index = 0
 
     def handle_input(self, event):
@@ -45,12 +50,18 @@ class MenuScene(BaseScene):
         choice = self.options[self.selected_index]
         if choice == "Iniciar Jogo":
             self.game.start_game()
+        elif choice == "Corrida Fantasma":
+            self.game.start_ghost_race()
         elif choice == "Selecionar Nível":
             self.game.change_state(STATE_SELECT_PHASE) 
         elif choice == "Ver Ranking":
             self.game.change_state(STATE_RANKING)
         elif choice == "Sair":
             self.game.change_state(STATE_QUIT)
+
+    def render_key(self):
+        return (self.selected_index, self.game.current_speed_setting['speed_name'],
+                self.game.current_mechanic_setting['mechanic_name'])
             
     def draw(self):
         self.screen.fill(BLACK) 
@@ -107,6 +118,9 @@ class PhaseSelectScene(BaseScene):
                 if event.key == pygame.K_RETURN:
                     self.game.change_state(STATE_MENU)
 
+    def render_key(self):
+        return (self.selected_index, self.mech_index, self.speed_index)
+
     def draw(self):
         self.screen.fill(BLACK)
         self.draw_text("SELEÇÃO DE NÍVEL", self.big_font, YELLOW, SCREEN_WIDTH // 2, 80, center=True)
@@ -131,13 +145,17 @@ class RankingScene(BaseScene):
         self.scores = [] 
 
     def load_scores(self):
-        """Carrega as pontuações do banco de dados (chamando o DBManager implementado)."""
+        """Carrega as pontuações do ranking (cache do DBManager; só consulta o SQLite quando outro processo altera o banco)."""
         self.scores = self.game.db_manager.get_top_scores()
 
     def handle_input(self, event):
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
             self.game.change_state(STATE_MENU)
 
+    def render_key(self):
+        self.load_scores()
+        return tuple(self.scores)
+
     def draw(self):
         self.load_scores() 
         
@@ -164,12 +182,29 @@ class UIScene:
             self.font = pygame.font.Font(None, 30)
         except pygame.error:
             self.font = pygame.font.Font(None, 30)
-
-    def draw(self, bird):
-        score_text = self.font.render(f"Pontuação: {bird.score}", True, WHITE)
-        self.game.screen.blit(score_text, (10, 10)) 
+        self.small_font = pygame.font.Font(None, 22)
+
+    def blit_items(self, bird):
+        """Pares (superfície, posição) que compõem o HUD, prontos para Surface.blits."""
+        items = []
+        # Rótulo fixo + glifos de dígitos pré-renderizados: a pontuação nunca gera um render novo.
+        score_label = text_cache.render(self.font, "Pontuação: ", WHITE)
+        items.append((score_label, (10, 10)))
+        x = 10 + score_label.get_width()
+        for glyph in text_cache.render_number(self.font, bird.score, WHITE):
+            items.append((glyph, (x, 10)))
+            x += glyph.get_width()
 
         mech_name = self.game.current_mechanic_setting['mechanic_name']
         speed_name = self.game.current_speed_setting['speed_name']
-        phase_text = self.font.render(f"Nível: {mech_name} ({speed_name})", True, YELLOW)
-        self.game.screen.blit(phase_text, (SCREEN_WIDTH - phase_text.get_width() - 10, 10))
\ No newline at end of file
+        phase_text = text_cache.render(self.font, f"Nível: {mech_name} ({speed_name})", YELLOW)
+        items.append((phase_text, (SCREEN_WIDTH - phase_text.get_width() - 10, 10)))
+        return items
+
+    def overlay_items(self, lines):
+        """Linhas do overlay de desempenho (FrameProfiler), abaixo da pontuação."""
+        return [(text_cache.render(self.small_font, line, GREEN), (10, 40 + i * 18)) for i, line in enumerate(lines)]
+
+    def draw(self, bird):
+        """Desenha o HUD e retorna as regiões da tela que foram alteradas."""
+        return self.game.screen.blits(self.blit_items(bird))
\ No newline at end of file
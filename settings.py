@@ -1,6 +1,13 @@
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60 
+SIM_MAX_STEPS_PER_FRAME = 5
+DIRTY_RECT_RENDERING = True
+
+LAYER_PIPES = 0
+LAYER_GHOSTS = 1
+LAYER_SPRITES = 2
+LAYER_HUD = 3
 
 GRAVITY = 0.35   
 FLAP_STRENGTH = -7
@@ -10,6 +17,73 @@ GAP_SIZE = 170
 PIPE_SPAWN_TIME = 1500 
 PLAYER_SIZE = 50 
 PIPE_V_SPEED = 1.0
+PIPE_AMPLITUDE = 50
+BIRD_START_POS = (100, SCREEN_HEIGHT // 3)
+BIRD_HITBOX_REDUCTION = 10
+PIPE_HITBOX_REDUCTION = 10
+PIXEL_PERFECT_COLLISIONS = True
+
+SCORE_WRITE_QUEUE_SIZE = 256
+SCORE_WRITE_BATCH_SIZE = 64
+LEADERBOARD_SIZE = 10
+LEADERBOARD_RECHECK_INTERVAL = 1.0
+IMPORT_CHUNK_SIZE = 20_000
+# Importações maiores que o banco vezes este fator gravam sem índices e os recriam no fim, em vez de atualizá-los.
+IMPORT_REBUILD_RATIO = 2.0
+IMPORT_CACHE_MB = 256  # cache de páginas do SQLite durante a importação
+RETENTION_DEPTH = 1000
+
+# Ranking compartilhado (opcional): endereço do leaderboard_server.py, "tcp://host:porta" ou "unix:/caminho".
+LEADERBOARD_SERVER = None
+LEADERBOARD_TIMEOUT = 2.0
+LEADERBOARD_RETRY_MAX = 30.0  # intervalo máximo entre tentativas de reconexão, em segundos
+LEADERBOARD_OUTBOX_SIZE = 4096  # pontuações guardadas enquanto o servidor está fora do ar
+LEADERBOARD_SUBMIT_BATCH = 64
+LEADERBOARD_SERVER_DEPTH = 100  # pontuações por modo mantidas em memória no servidor
+LEADERBOARD_SERVER_BATCH = 1024  # máximo de pontuações por transação no servidor
+
+TEXT_CACHE_SIZE = 256
+
+COURSE_LOOKAHEAD = 8
+
+GHOST_COUNT = 50
+# Cada modo tem um percurso fixo de Corrida Fantasma, derivado desta semente e do nome do modo.
+GHOST_COURSE_SEED = 0x47484F53
+GHOST_ALPHA = 90
+GHOST_LOOKAHEAD_TICKS = 120
+
+PROFILE_WINDOW = 600
+PROFILE_OVERLAY_REFRESH = 30
+PROFILE_DEFAULT_FILE = 'frame_profile.json'
+
+# Quadro de desenho: fração da resolução lógica (0.5 em máquinas fracas) e como ele chega à tela.
+RENDER_SCALE = 1.0
+DISPLAY_MODE = 'window'  # 'window' (sem escala), 'scaled' (pygame.SCALED, escala na GPU) ou 'blit' (um transform.scale por frame)
+DISPLAY_FULLSCREEN = False
+DISPLAY_SIZE = None  # janela do modo 'blit'; None = tamanho lógico (ou o do desktop em tela cheia)
+RENDER_SCALE_CACHE_SIZE = 512
+
+# Fundo em paralaxe: céu + silhuetas da cidade, na velocidade dos canos vezes o fator de cada camada.
+# Nos frames em que o céu anda um pixel a tela inteira é apresentada; nos demais, só a faixa das silhuetas
+# que andaram e os sprites. False volta ao céu fixo (só as regiões dos sprites).
+PARALLAX_BACKGROUND = True
+PARALLAX_SKY_FACTOR = 0.1
+# (fator de velocidade, altura da faixa em fração da tela, cor dos prédios, cor das janelas ou None)
+PARALLAX_LAYERS = (
+    (0.3, 0.45, (52, 22, 70), None),
+    (0.6, 0.30, (22, 10, 32), (235, 200, 90)),
+)
+BACKGROUND_SEED = 1939
+
+AUTOPILOT_HORIZON = 120
+AUTOPILOT_MAX_NODES = 3000
+ATTRACT_IDLE_SECONDS = 20.0
+
+LOG_FILE = 'error.log'
+LOG_LEVEL = 'INFO'
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
@@ -23,6 +97,10 @@ STATE_RANKING = "RANKING"
 STATE_QUIT = "QUIT"
 STATE_GAME_OVER = "GAME_OVER"
 STATE_SELECT_PHASE = "SELECT_PHASE" 
+STATE_GHOST_RACE = "GHOST_RACE"
+STATE_ATTRACT = "ATTRACT"
+# Estados em que a partida roda (simulação + frame interpolado).
+PLAYING_STATES = (STATE_PLAYING, STATE_GHOST_RACE, STATE_ATTRACT)
 
 DIFFICULTY_SPEEDS = {
     "FÁCIL": {"pipe_speed": 3, "fps_mult": 1.0},
@@ -0,0 +1,52 @@
+import argparse
+import time
+
+from settings import DIFFICULTY_SPEEDS, PHASE_MECHANICS
+from simulation import HeadlessSimulation, scripted_policy, random_policy
+from autopilot import autopilot_policy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação headless (sem janela) de várias partidas em sequência.")
+    parser.add_argument('--runs', type=int, default=1000, help="Número de partidas simuladas.")
+    parser.add_argument('--speed', default="FÁCIL", choices=list(DIFFICULTY_SPEEDS.keys()))
+    parser.add_argument('--mechanic', default="ESTÁTICO", choices=list(PHASE_MECHANICS.keys()))
+    parser.add_argument('--policy', default="scripted", choices=["scripted", "random", "autopilot"])
+    parser.add_argument('--seed', type=int, default=0, help="Semente da primeira partida (as seguintes usam seed + i).")
+    parser.add_argument('--max-ticks', type=int, default=20000, help="Limite de ticks por partida.")
+    parser.add_argument('--pixel-masks', action='store_true',
+                        help="Colisão por pixel, como no jogo (carrega as máscaras de bird.png/pipe.png).")
+    args = parser.parse_args()
+
+    masks = None
+    if args.pixel_masks:
+        from collision import load_collision_masks
+        masks = load_collision_masks()
+
+    total_ticks = 0
+    scores = []
+    autopilot = autopilot_policy(masks=masks) if args.policy == "autopilot" else None
+
+    start = time.perf_counter()
+    for i in range(args.runs):
+        seed = args.seed + i
+        sim = HeadlessSimulation.from_settings(args.speed, args.mechanic, seed, masks=masks)
+        if autopilot:
+            policy = autopilot
+        else:
+            policy = scripted_policy if args.policy == "scripted" else random_policy(seed=seed)
+        scores.append(sim.run(policy, max_ticks=args.max_ticks))
+        total_ticks += sim.tick
+    elapsed = time.perf_counter() - start
+
+    print(f"Partidas: {args.runs} | Ticks simulados: {total_ticks} | Tempo: {elapsed:.2f}s")
+    print(f"Ticks/s: {total_ticks / elapsed:,.0f} | Partidas/min: {args.runs / elapsed * 60:,.0f}")
+    print(f"Pontuação média: {sum(scores) / len(scores):.1f} | Máxima: {max(scores)}")
+    if autopilot:
+        stats = autopilot.autopilot.stats()
+        print(f"Piloto automático: {stats['decisions_per_second']:,.0f} decisões/s | "
+              f"{stats['nodes_per_decision']:.1f} nós por decisão | {stats['ms_per_decision']:.3f} ms por decisão")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+import math
+import random
+from collections import namedtuple
+from settings import *
+from course import Course, segment_x
+
+
+def tick_rate(speed_setting):
+    """Ticks de simulação por segundo para a velocidade escolhida (a dificuldade acelera a simulação, não o render)."""
+    return FPS * speed_setting['fps_mult']
+
+
+def spawn_interval_ticks(rate, spawn_time=PIPE_SPAWN_TIME):
+    """Converte PIPE_SPAWN_TIME (ms) em ticks de simulação."""
+    return max(1, round(spawn_time / 1000.0 * rate))
+
+
+def next_vertical_speed(vertical_speed, gravity=GRAVITY, max_fall_speed=MAX_FALL_SPEED):
+    """Aplica um tick de gravidade, limitado por MAX_FALL_SPEED."""
+    vertical_speed += gravity
+    if vertical_speed > max_fall_speed:
+        vertical_speed = max_fall_speed
+    return vertical_speed
+
+
+def pipe_y_offset(sim_time, v_speed_mult, amplitude):
+    """Deslocamento vertical do cano móvel no instante de simulação informado (em segundos)."""
+    return int(amplitude * math.sin(sim_time * v_speed_mult * PIPE_V_SPEED))
+
+
+class FixedTimestep:
+    """Acumulador de passo fixo: converte o tempo real de cada frame em ticks de simulação."""
+
+    def __init__(self, rate, max_steps=SIM_MAX_STEPS_PER_FRAME):
+        self.max_steps = max_steps
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.reset()
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.tick = 0
+        self.skipped_steps = 0
+
+    def advance(self, frame_time):
+        """Soma o tempo do frame e retorna quantos ticks devem ser simulados agora."""
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.dt)
+
+        if steps > self.max_steps:
+            # Evita a "espiral da morte": o excedente é descartado e o jogo desacelera em vez de travar.
+            self.skipped_steps += steps - self.max_steps
+            self.accumulator -= (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+
+        self.accumulator -= steps * self.dt
+        self.tick += steps
+        return steps
+
+    @property
+    def alpha(self):
+        """Fração do próximo tick já decorrida, usada para interpolar a renderização."""
+        return self.accumulator / self.dt
+
+
+StepResult = namedtuple('StepResult', ['tick', 'bird_y', 'vertical_speed', 'score', 'collided'])
+CollisionMasks = namedtuple('CollisionMasks', ['bird', 'top', 'bottom'])
+
+
+class RowMask:
+    """Máscara de colisão em Python puro: cada linha é um inteiro cujo bit i é o pixel x=i.
+
+    Reproduz exatamente pygame.Mask.overlap, sem depender do pygame em tempo de simulação.
+    """
+
+    def __init__(self, width, height, rows):
+        self.width = width
+        self.height = height
+        self.rows = rows
+
+    @classmethod
+    def from_mask(cls, mask):
+        width, height = mask.get_size()
+        rows = []
+        for y in range(height):
+            bits = 0
+            for x in range(width):
+                if mask.get_at((x, y)):
+                    bits |= 1 << x
+            rows.append(bits)
+        return cls(width, height, rows)
+
+    def overlaps(self, other, dx, dy):
+        """True se `other`, deslocada de (dx, dy) em relação a esta máscara, tem algum pixel em comum."""
+        rows = self.rows
+        other_rows = other.rows
+        for y in range(max(0, dy), min(self.height, dy + other.height)):
+            a = rows[y]
+            b = other_rows[y - dy]
+            if dx >= 0:
+                if (a >> dx) & b:
+                    return True
+            elif (a << -dx) & b:
+                return True
+        return False
+
+
+class HeadlessSimulation:
+    """Réplica sem pygame da lógica de Bird, PipeManager e Game.check_collisions.
+
+    Cada chamada de step() avança exatamente um tick, como Game.step_simulation,
+    usando apenas aritmética de inteiros/float: não abre janela, não carrega assets
+    e não consulta o relógio. Com `masks` (CollisionMasks), a colisão com os canos é
+    por pixel, como no jogo com PIXEL_PERFECT_COLLISIONS; sem elas, usa as hitboxes.
+    """
+
+    BIRD_SIZE = PLAYER_SIZE - BIRD_HITBOX_REDUCTION * 2
+    PIPE_HITBOX_WIDTH = PIPE_WIDTH - PIPE_HITBOX_REDUCTION * 2
+    PIPE_HEIGHT = int(SCREEN_HEIGHT * 1.5)
+
+    def __init__(self, seed=None, pipe_speed=3, fps_mult=1.0, v_speed_mult=0.0,
+                 gap_size=GAP_SIZE, spawn_time=PIPE_SPAWN_TIME, gravity=GRAVITY,
+                 flap_strength=FLAP_STRENGTH, max_fall_speed=MAX_FALL_SPEED, masks=None):
+        self.masks = masks
+        self.pipe_speed = pipe_speed
+        self.v_speed_mult = v_speed_mult
+        self.gap_size = gap_size
+        self.gravity = gravity
+        self.flap_strength = flap_strength
+        self.max_fall_speed = max_fall_speed
+        self.rate = FPS * fps_mult
+        self.spawn_interval = spawn_interval_ticks(self.rate, spawn_time)
+        self.seed = seed
+        self.reset(seed)
+
+    @classmethod
+    def from_settings(cls, speed_key="FÁCIL", mechanic_key="ESTÁTICO", seed=None, masks=None):
+        speed = DIFFICULTY_SPEEDS[speed_key]
+        mechanic = PHASE_MECHANICS[mechanic_key]
+        return cls(seed=seed, pipe_speed=speed['pipe_speed'], fps_mult=speed['fps_mult'],
+                   v_speed_mult=mechanic['v_speed_mult'], masks=masks)
+
+    def reset(self, seed=None):
+        self.course = Course(seed, self.spawn_interval)
+        self.tick = 0
+        # Bird.reset() recoloca o topo-esquerdo da hitbox exatamente em BIRD_START_POS.
+        self.bird_x, self.bird_y = BIRD_START_POS
+        self.vertical_speed = 0
+        self.is_started = False
+        self.score = 0
+        self.collided = False
+        # Cada par de canos: [x (float), x (int), y do topo do vão, y da base do vão, passou]
+        self.pipes = []
+
+    def _spawn_pipe(self):
+        gap_center_y = self.course.next_segment().gap_center
+        x = SCREEN_WIDTH + PIPE_HITBOX_REDUCTION
+        self.pipes.append([float(x), x, gap_center_y - self.gap_size // 2,
+                           gap_center_y + self.gap_size // 2, False])
+
+    def step(self, flap=False):
+        """Avança um tick. Retorna StepResult com estado, pontuação e colisão."""
+        if self.collided:
+            return StepResult(self.tick, self.bird_y, self.vertical_speed, self.score, True)
+
+        if flap:
+            self.vertical_speed = self.flap_strength
+            self.is_started = True
+
+        # Bird.update
+        if self.is_started:
+            self.vertical_speed = next_vertical_speed(self.vertical_speed, self.gravity, self.max_fall_speed)
+            self.bird_y += int(self.vertical_speed)
+
+        # PipeManager.update
+        self.tick += 1
+        if self.tick >= self.course.peek().spawn_tick:
+            self._spawn_pipe()
+
+        offset = 0
+        if self.v_speed_mult > 0:
+            offset = pipe_y_offset(self.tick / self.rate, self.v_speed_mult, PIPE_AMPLITUDE)
+
+        bird_x = self.bird_x
+        bird_y = self.bird_y
+        size = self.BIRD_SIZE
+        width = self.PIPE_HITBOX_WIDTH
+        height = self.PIPE_HEIGHT
+        masks = self.masks
+        collided = False
+
+        for pipe in list(self.pipes):
+            pipe[0] -= self.pipe_speed
+            x = pipe[1] = int(pipe[0])
+
+            if x + width < 0:
+                self.pipes.remove(pipe)
+                continue
+
+            # Cada par equivale a dois sprites no jogo: ambos pontuam.
+            if not pipe[4] and x + width // 2 < bird_x:
+                self.score += 2
+                pipe[4] = True
+
+            # Game.check_collisions: fase ampla pela faixa x, fase estreita por máscara ou hitbox.
+            if masks is not None:
+                if bird_x < x + PIPE_WIDTH and bird_x + PLAYER_SIZE > x:
+                    dx = x - bird_x
+                    if masks.bird.overlaps(masks.top, dx, pipe[2] + offset - height - bird_y) or \
+                            masks.bird.overlaps(masks.bottom, dx, pipe[3] + offset - bird_y):
+                        collided = True
+            elif bird_x < x + width and bird_x + size > x:
+                gap_top = pipe[2] + offset
+                gap_bottom = pipe[3] + offset
+                if (bird_y < gap_top and bird_y + size > gap_top - height) or \
+                        (bird_y < gap_bottom + height and bird_y + size > gap_bottom):
+                    collided = True
+
+        if not collided and self.is_started:
+            if bird_y <= 0 or bird_y + size >= SCREEN_HEIGHT:
+                collided = True
+
+        self.collided = collided
+        return StepResult(self.tick, bird_y, self.vertical_speed, self.score, collided)
+
+    def next_gap(self):
+        """Retorna (x, topo, base) do próximo vão à frente do pássaro, ou None."""
+        offset = 0
+        if self.v_speed_mult > 0:
+            offset = pipe_y_offset(self.tick / self.rate, self.v_speed_mult, PIPE_AMPLITUDE)
+        for pipe in self.pipes:
+            if pipe[1] + self.PIPE_HITBOX_WIDTH >= self.bird_x:
+                return (pipe[1], pipe[2] + offset, pipe[3] + offset)
+        return None
+
+    def upcoming_gaps(self, count):
+        """(x, topo, base) dos próximos `count` vãos à frente do pássaro: primeiro os canos já na tela,
+        depois os segmentos do percurso que ainda vão nascer (x projetado pela velocidade dos canos)."""
+        offset = 0
+        if self.v_speed_mult > 0:
+            offset = pipe_y_offset(self.tick / self.rate, self.v_speed_mult, PIPE_AMPLITUDE)
+        gaps = [(pipe[1], pipe[2] + offset, pipe[3] + offset)
+                for pipe in self.pipes if pipe[1] + self.PIPE_HITBOX_WIDTH >= self.bird_x][:count]
+        if len(gaps) < count:
+            half = self.gap_size // 2
+            for segment in self.course.upcoming(count - len(gaps)):
+                gaps.append((segment_x(segment, self.tick, self.pipe_speed),
+                             segment.gap_center - half + offset, segment.gap_center + half + offset))
+        return gaps
+
+    def run(self, policy, max_ticks=None):
+        """Executa até colidir (ou até max_ticks). policy(sim) -> bool decide o flap de cada tick."""
+        while not self.collided:
+            if max_ticks is not None and self.tick >= max_ticks:
+                break
+            self.step(policy(self))
+        return self.score
+
+
+def scripted_policy(sim):
+    """Jogador simples: bate asas quando está abaixo do centro do próximo vão e já caindo."""
+    gap = sim.next_gap()
+    target = (gap[1] + gap[2]) // 2 if gap else SCREEN_HEIGHT // 2
+    return sim.bird_y + sim.BIRD_SIZE // 2 > target + 10 and sim.vertical_speed >= 0
+
+
+def random_policy(flap_probability=0.06, seed=None):
+    """Cria uma política que bate asas aleatoriamente com a probabilidade informada."""
+    rng = random.Random(seed)
+    return lambda sim: rng.random() < flap_probability
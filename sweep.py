@@ -0,0 +1,139 @@
+"""Varredura de dificuldade: simula partidas headless para cada combinação de parâmetros em todos os núcleos."""
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from settings import *
+from simulation import HeadlessSimulation, scripted_policy, random_policy, tick_rate
+from autopilot import autopilot_policy
+
+SWEEP_PARAMS = ['pipe_speed', 'fps_mult', 'gap_size', 'spawn_time', 'v_speed_mult', 'gravity', 'flap_strength', 'max_fall_speed']
+
+
+def unit_seed(base_seed, config_id, unit_id):
+    """Semente independente e reprodutível para cada unidade de trabalho."""
+    return int(np.random.SeedSequence([base_seed, config_id, unit_id]).generate_state(1)[0])
+
+
+def horizon_ticks(params, max_seconds):
+    """Limite de ticks da configuração: o mesmo tempo de jogo em qualquer fps_mult."""
+    return round(max_seconds * tick_rate(params))
+
+
+def run_unit(args):
+    """Executa um bloco de partidas de uma configuração. Roda dentro dos processos do pool."""
+    config_id, unit_id, params, runs, policy_name, max_seconds, base_seed, masks = args
+    max_ticks = horizon_ticks(params, max_seconds)
+    seed = unit_seed(base_seed, config_id, unit_id)
+    if policy_name == 'autopilot':
+        policy = autopilot_policy(masks=masks)
+    else:
+        policy = scripted_policy if policy_name == 'scripted' else random_policy(seed=seed)
+
+    seeds = np.empty(runs, dtype=np.uint32)
+    scores = np.empty(runs, dtype=np.int32)
+    ticks = np.empty(runs, dtype=np.int32)
+
+    for i in range(runs):
+        run_seed = (seed + i) & 0xFFFFFFFF
+        sim = HeadlessSimulation(seed=run_seed, masks=masks, **params)
+        scores[i] = sim.run(policy, max_ticks=max_ticks)
+        ticks[i] = sim.tick
+        seeds[i] = run_seed
+
+    return config_id, seeds, scores, ticks
+
+
+def build_configs(args):
+    # A velocidade de cada dificuldade é o par (pipe_speed, fps_mult): a taxa de ticks também muda o
+    # intervalo entre canos e o período da senoide. Com --pipe-speed, as faixas são cruzadas com --fps-mult.
+    if args.pipe_speed is not None:
+        speeds = list(itertools.product(args.pipe_speed, args.fps_mult))
+    else:
+        speeds = [(DIFFICULTY_SPEEDS[name]['pipe_speed'], DIFFICULTY_SPEEDS[name]['fps_mult']) for name in args.speed]
+    grid = [speeds] + [getattr(args, name) for name in SWEEP_PARAMS[2:]]
+    return [dict(zip(SWEEP_PARAMS, speed + tuple(values))) for speed, *values in itertools.product(*grid)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--speed', nargs='+', choices=list(DIFFICULTY_SPEEDS), default=list(DIFFICULTY_SPEEDS),
+                        help="Dificuldades cujo par (pipe_speed, fps_mult) entra na varredura.")
+    parser.add_argument('--pipe-speed', dest='pipe_speed', type=float, nargs='+', default=None,
+                        help="Faixa livre de pipe_speed (substitui --speed), cruzada com --fps-mult.")
+    parser.add_argument('--fps-mult', dest='fps_mult', type=float, nargs='+', default=[1.0])
+    parser.add_argument('--gap-size', dest='gap_size', type=int, nargs='+', default=[GAP_SIZE])
+    parser.add_argument('--spawn-time', dest='spawn_time', type=int, nargs='+', default=[PIPE_SPAWN_TIME])
+    parser.add_argument('--v-speed-mult', dest='v_speed_mult', type=float, nargs='+',
+                        default=sorted({m['v_speed_mult'] for m in PHASE_MECHANICS.values()}))
+    parser.add_argument('--gravity', type=float, nargs='+', default=[GRAVITY])
+    parser.add_argument('--flap-strength', dest='flap_strength', type=float, nargs='+', default=[FLAP_STRENGTH])
+    parser.add_argument('--max-fall-speed', dest='max_fall_speed', type=float, nargs='+', default=[MAX_FALL_SPEED])
+    parser.add_argument('--runs', type=int, default=200, help="Partidas por configuração.")
+    parser.add_argument('--runs-per-unit', type=int, default=50, help="Partidas por unidade de trabalho do pool.")
+    parser.add_argument('--policy', default='scripted', choices=['scripted', 'random', 'autopilot'])
+    parser.add_argument('--max-seconds', dest='max_seconds', type=float, default=120.0,
+                        help="Limite em segundos de jogo, convertido em ticks pela taxa de cada configuração; quem chega nele sobreviveu.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', default='sweep_results.npz')
+    parser.add_argument('--pixel-masks', action='store_true', help="Colisão por pixel, como no jogo.")
+    args = parser.parse_args()
+
+    masks = None
+    if args.pixel_masks:
+        from collision import load_collision_masks
+        masks = load_collision_masks()
+
+    configs = build_configs(args)
+    units = []
+    for config_id, params in enumerate(configs):
+        remaining = args.runs
+        unit_id = 0
+        while remaining > 0:
+            runs = min(args.runs_per_unit, remaining)
+            units.append((config_id, unit_id, params, runs, args.policy, args.max_seconds, args.seed, masks))
+            remaining -= runs
+            unit_id += 1
+
+    start = time.perf_counter()
+    results = {config_id: [] for config_id in range(len(configs))}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # map() preserva a ordem das unidades, então o arquivo final independe do número de processos.
+        for config_id, seeds, scores, ticks in pool.map(run_unit, units):
+            results[config_id].append((seeds, scores, ticks))
+    elapsed = time.perf_counter() - start
+
+    columns = {'config_id': [], 'seed': [], 'score': [], 'ticks': []}
+    for config_id, chunks in results.items():
+        for seeds, scores, ticks in chunks:
+            columns['config_id'].append(np.full(len(scores), config_id, dtype=np.int32))
+            columns['seed'].append(seeds)
+            columns['score'].append(scores)
+            columns['ticks'].append(ticks)
+    columns = {name: np.concatenate(parts) for name, parts in columns.items()}
+    max_ticks = np.array([horizon_ticks(config, args.max_seconds) for config in configs], dtype=np.int32)
+    columns['survived'] = columns['ticks'] >= max_ticks[columns['config_id']]
+    for name in SWEEP_PARAMS:
+        columns[f'config_{name}'] = np.array([config[name] for config in configs], dtype=np.float64)
+    columns['config_max_ticks'] = max_ticks
+
+    np.savez_compressed(args.output, **columns)
+
+    total_runs = len(columns['score'])
+    print(f"{len(configs)} configurações, {total_runs} partidas, {columns['ticks'].sum():,} ticks "
+          f"em {elapsed:.1f}s com {args.workers} processos -> {args.output}")
+    for config_id, config in enumerate(configs):
+        mask = columns['config_id'] == config_id
+        scores = columns['score'][mask]
+        label = ", ".join(f"{k}={v:g}" for k, v in config.items())
+        print(f"[{config_id}] {label}: sobrevivência {columns['survived'][mask].mean():.0%} | "
+              f"pontuação p50={np.percentile(scores, 50):g} p90={np.percentile(scores, 90):g} máx={scores.max()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / 'ranking.db'))
+    for name, score, difficulty in [
+        ('A', 50, 'ESTÁTICO (FÁCIL)'),
+        ('B', 40, 'ESTÁTICO (DIFÍCIL)'),
+        ('C', 30, 'MÓVEL (PERSEGUIÇÃO) (DIFÍCIL)'),
+        ('D', 20, 'MÓVEL (PERSEGUIÇÃO) (FÁCIL)'),
+        ('E', 10, 'ESTÁTICO (FÁCIL)'),
+    ]:
+        manager.save_score(name, score, difficulty)
+    manager.flush()
+    yield manager
+    manager.close()
+
+
+def test_get_rank_overall_and_by_mode(db):
+    assert db.get_rank(35) == 3
+    assert db.get_rank(35, 'ESTÁTICO', 'FÁCIL') == 2
+    assert db.get_rank(35, 'MÓVEL (PERSEGUIÇÃO)', 'DIFÍCIL') == 1
+
+
+def test_get_rank_filters_on_mechanic_or_speed_alone(db):
+    assert db.get_rank(25, mechanic='ESTÁTICO') == 3
+    assert db.get_rank(25, mechanic='MÓVEL (PERSEGUIÇÃO)') == 2
+    assert db.get_rank(25, speed='DIFÍCIL') == 3
+    assert db.get_rank(25, speed='FÁCIL') == 2
+
+
+def test_mode_page_reads_only_the_index(db):
+    plan = db._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT name, score, difficulty, timestamp, id FROM scores "
+        "WHERE mechanic = ? AND speed = ? ORDER BY score DESC, timestamp ASC, id ASC LIMIT 10",
+        ('ESTÁTICO', 'FÁCIL')).fetchall()
+    details = " | ".join(row[-1] for row in plan)
+    assert 'COVERING INDEX idx_scores_mode' in details
+    assert 'TEMP B-TREE' not in details
+
+
+def test_player_page_reads_the_player_index_in_order(db):
+    plan = db._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT name, score, difficulty, timestamp, id FROM scores "
+        "WHERE name = ? ORDER BY score DESC, timestamp ASC, id ASC LIMIT 10", ('A',)).fetchall()
+    details = " | ".join(row[-1] for row in plan)
+    assert 'INDEX idx_scores_player' in details
+    assert 'TEMP B-TREE' not in details
+
+
+def test_writer_keeps_identical_games(db):
+    row = ('Player', 7, 'ESTÁTICO (FÁCIL)', '2026-01-01 00:00:00', None)
+    db._write_batch(db._conn, [row + ('partida-1',), row + ('partida-2',)])
+    assert db._conn.execute("SELECT COUNT(*) FROM scores WHERE name = 'Player'").fetchone()[0] == 2
+
+
+def test_migration_keeps_repeated_rows(tmp_path):
+    path = str(tmp_path / 'ranking.db')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE scores (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+                 "score INTEGER NOT NULL, difficulty TEXT NOT NULL, timestamp TEXT NOT NULL)")
+    conn.executemany("INSERT INTO scores (name, score, difficulty, timestamp) VALUES (?, ?, ?, ?)",
+                     [('Player', 3, 'ESTÁTICO (FÁCIL)', '2025-06-01 12:00:00')] * 2)
+    conn.commit()
+    conn.close()
+    manager = DatabaseManager(path)
+    try:
+        assert manager._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 2
+    finally:
+        manager.close()
+
+
+def test_import_skips_repeated_scores(db):
+    exported = list(db.iter_scores())
+    legacy = ('F', 60, 'ESTÁTICO (MÉDIO)', '2026-01-01 00:00:00', None, None)
+    assert db.import_scores(exported + [legacy, legacy]) == (7, 1)
+    # A mesma partida com outro id de envio veio de outro gabinete.
+    assert db.import_scores([exported[0][:5] + ('outro-gabinete',)]) == (1, 1)
+
+
+def test_server_insert_dedupes_on_submission_id(db):
+    game = ('Player', 5, 'ESTÁTICO (FÁCIL)', '2026-01-01 00:00:00', None, 'gabinete-1')
+    twin = game[:5] + ('gabinete-2',)
+    assert db.insert_new_scores([game, twin]) == [True, True]
+    assert db.insert_new_scores([twin, game]) == [False, False]
+
+
+def test_bulk_import_rebuilds_indexes_and_drops_repeats(tmp_path):
+    manager = DatabaseManager(str(tmp_path / 'ranking.db'))
+    rows = [(f'P{i % 50}', i % 7, 'MÓVEL (PERSEGUIÇÃO) (FÁCIL)', f'2026-01-01 00:00:{i % 60:02d}', None, None)
+            for i in range(300)]
+    try:
+        assert manager.import_scores(rows + rows[:40], chunk_size=64) == (340, 300)
+        assert manager._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 300
+        indexes = {row[0] for row in manager._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {'idx_scores_rank', 'idx_scores_mode', 'idx_scores_player', 'idx_scores_day'} <= indexes
+    finally:
+        manager.close()
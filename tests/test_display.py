@@ -0,0 +1,37 @@
+import os
+import random
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import pytest
+
+from display import Display
+
+
+@pytest.fixture(autouse=True)
+def video():
+    pygame.display.init()
+    yield
+    pygame.display.quit()
+
+
+@pytest.mark.parametrize('scale, window_size', [(1.0, (1440, 1080)), (0.5, (1366, 1024)), (1.0, (1024, 768))])
+def test_blit_present_of_regions_matches_full_scale(scale, window_size):
+    display = Display(scale=scale, mode='blit', fullscreen=False, window_size=window_size)
+    rng = random.Random(7)
+    width, height = display.render_size
+    display.target.fill((20, 40, 60))
+    display.present()
+    for _ in range(5):
+        rects = []
+        for _ in range(6):
+            rect = pygame.Rect(rng.randrange(-20, width), rng.randrange(-20, height), rng.randint(1, 90), rng.randint(1, 90))
+            display.target.fill((rng.randrange(256), rng.randrange(256), rng.randrange(256)), rect)
+            rects.append(rect)
+        display.present(rects)
+
+    expected = pygame.transform.scale(display.target, display._output.get_size())
+    assert pygame.image.tobytes(display._output, 'RGB') == pygame.image.tobytes(expected, 'RGB')
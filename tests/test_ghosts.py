@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ghosts import course_seed, select_ghosts
+from replay import Replay
+
+
+def _row(row_id, seed, score):
+    return row_id, f'P{row_id}', score, Replay(seed, 'FÁCIL', 'ESTÁTICO', False, [3, 9], score, 40).encode()
+
+
+def test_course_seed_is_fixed_per_mode():
+    assert course_seed('ESTÁTICO', 'FÁCIL') == course_seed('ESTÁTICO', 'FÁCIL')
+    assert course_seed('ESTÁTICO', 'FÁCIL') != course_seed('ESTÁTICO', 'DIFÍCIL')
+
+
+def test_select_ghosts_keeps_every_run_on_the_course():
+    seed = course_seed('ESTÁTICO', 'FÁCIL')
+    rows = [_row(1, 12345, 90), _row(2, seed, 80), _row(3, seed, 70), (4, 'X', 60, b'lixo'), _row(5, seed, 50)]
+    assert [replay.score for replay in select_ghosts(rows, seed)] == [80, 70, 50]
+    assert [replay.score for replay in select_ghosts(rows, seed, count=2)] == [80, 70]
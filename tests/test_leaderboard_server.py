@@ -0,0 +1,39 @@
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard_client import encode_message, encode_score
+from leaderboard_server import LeaderboardServer
+
+
+def test_write_failure_answers_the_batch_and_keeps_writing(tmp_path):
+    async def scenario():
+        server = LeaderboardServer(str(tmp_path / 'central.db'))
+        insert_new_scores = server.db.insert_new_scores
+        calls = []
+
+        def failing_once(rows):
+            calls.append(rows)
+            if len(calls) == 1:
+                raise RuntimeError("falha simulada")
+            return insert_new_scores(rows)
+
+        server.db.insert_new_scores = failing_once
+        await server.start('tcp://127.0.0.1:0')
+        host, port = server.sockname()[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+        row = ('A', 10, 'ESTÁTICO (FÁCIL)', '2026-01-01 00:00:00', None, 'partida-1')
+        replies = []
+        for _ in range(2):
+            writer.write(encode_message({'op': 'submit', 'scores': [encode_score(row)]}))
+            replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+        writer.close()
+        await server.close()
+        return replies
+
+    failed, written = asyncio.run(scenario())
+    assert not failed['ok'] and 'falha simulada' in failed['error']
+    assert written == {'ok': True, 'inserted': 1}
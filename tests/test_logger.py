@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger import GameLogger
+
+
+def test_second_log_file_is_rejected_until_shutdown(tmp_path):
+    GameLogger.shutdown()
+    first, second = str(tmp_path / 'a.log'), str(tmp_path / 'b.log')
+    try:
+        GameLogger(first).log_error("primeiro")
+        GameLogger(first)
+        with pytest.raises(ValueError):
+            GameLogger(second)
+        GameLogger.shutdown()
+        GameLogger(second).log_error("segundo")
+    finally:
+        GameLogger.shutdown()
+    with open(first, encoding='utf-8') as f:
+        assert "primeiro" in f.read()
+    with open(second, encoding='utf-8') as f:
+        assert "segundo" in f.read()